@@ -6,7 +6,7 @@ a = Analysis(
     ['src/main.py'],
     pathex=[],
     binaries=[],
-    datas=[],
+    datas=[('src/data/classes.json', 'src/data')],
     hiddenimports=['pygame'],
     hookspath=[],
     hooksconfig={},
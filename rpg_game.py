@@ -1,8 +1,9 @@
 import curses
 import time
 import random
-from character import Character
-from battle_system import BattleSystem
+from src.components.character import Character
+from src.components.battle_system import BattleSystem
+from src.components.class_registry import CLASSES, CHARACTER_STATS
 from game_ui import GameUI
 
 class Game:
@@ -33,30 +34,7 @@ class Game:
         curses.endwin()
 
     def draw_character(self, character, x, y, is_player=True):
-        if character.name == "Warrior":
-            art = [
-                "  ⚔️  ",
-                " /|\\ ",
-                " / \\ "
-            ]
-        elif character.name == "Mage":
-            art = [
-                "  🧙  ",
-                " /|\\ ",
-                " / \\ "
-            ]
-        elif character.name == "Archer":
-            art = [
-                "  🏹  ",
-                " /|\\ ",
-                " / \\ "
-            ]
-        else: 
-            art = [
-                "  👾  ",
-                " /|\\ ",
-                " / \\ "
-            ]
+        art = character.character_class.art
 
         color_pair = 4 if is_player else 5
         for i, line in enumerate(art):
@@ -96,15 +74,10 @@ class Game:
             for i in range(5):
                 self.stdscr.clear()
                 self.draw_battle_screen()
-                if attacker.name == "Mage":
-                    spell = "*" * (abs(end_x - start_x) // 5 * (i + 1))
-                    self.stdscr.addstr(max_y // 2, start_x, spell, curses.color_pair(6))
-                elif attacker.name == "Warrior":
-                    rage = "!" * (abs(end_x - start_x) // 5 * (i + 1))
-                    self.stdscr.addstr(max_y // 2, start_x, rage, curses.color_pair(6))
-                elif attacker.name == "Archer":
-                    arrow = "→" * (abs(end_x - start_x) // 5 * (i + 1))
-                    self.stdscr.addstr(max_y // 2, start_x, arrow, curses.color_pair(6))
+                trail = attacker.character_class.trail
+                if trail is not None:
+                    trail = trail * (abs(end_x - start_x) // 5 * (i + 1))
+                    self.stdscr.addstr(max_y // 2, start_x, trail, curses.color_pair(6))
                 self.stdscr.refresh()
                 time.sleep(0.1)
 
@@ -141,9 +114,9 @@ class Game:
 
     def select_character_class(self):
         classes = {
-            '1': ('Warrior', {'health': 120, 'attack': 15, 'defense': 10}),
-            '2': ('Mage', {'health': 80, 'attack': 20, 'defense': 5}),
-            '3': ('Archer', {'health': 100, 'attack': 18, 'defense': 8})
+            '1': ('Warrior', CHARACTER_STATS['Warrior']),
+            '2': ('Mage', CHARACTER_STATS['Mage']),
+            '3': ('Archer', CHARACTER_STATS['Archer'])
         }
         
         self.stdscr.clear()
@@ -154,13 +127,7 @@ class Game:
         
         y = 4
         for i, (class_name, stats) in enumerate(classes.values(), 1):
-            if class_name == "Warrior":
-                icon = "⚔️"
-            elif class_name == "Mage":
-                icon = "🧙"
-            else:
-                icon = "🏹"
-            
+            icon = CLASSES[class_name].icon
             self.stdscr.addstr(y, (max_x - 20) // 2, f"{i}. {icon} {class_name}")
             self.stdscr.addstr(y + 1, (max_x - 40) // 2, 
                              f"Health: {stats['health']} Attack: {stats['attack']} Defense: {stats['defense']}")
@@ -178,7 +145,7 @@ class Game:
             self.setup_curses()
             
             self.player = self.select_character_class()
-            self.enemy = Character("Enemy", {'health': 100, 'attack': 12, 'defense': 8})
+            self.enemy = Character("Enemy", CHARACTER_STATS['Enemy'])
             
             self.battle_system = BattleSystem(self.player, self.enemy)
             
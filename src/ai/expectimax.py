@@ -0,0 +1,163 @@
+import time
+
+from src.simulation.solver import Fighter, end_turn, pack, state_from_characters, WIN
+from src.utils.constants import BURN_DURATION
+
+
+class SearchTimeout(Exception):
+    pass
+
+
+class TranspositionTable:
+    def __init__(self, bits=18):
+        self.size = 1 << bits
+        self.shift = 64 - bits
+        self.generation = 0
+        self.epoch = 0
+        self.hits = 0
+        self.misses = 0
+        self.clear()
+
+    def _slot(self, key):
+        return ((key * 0x9E3779B97F4A7C15) & 0xFFFFFFFFFFFFFFFF) >> self.shift
+
+    def get(self, key):
+        key = key << 16 | self.epoch
+        slot = self._slot(key)
+        if self.keys[slot] == key:
+            self.hits += 1
+            return self.values[slot]
+        self.misses += 1
+        return None
+
+    def put(self, key, value, depth):
+        key = key << 16 | self.epoch
+        slot = self._slot(key)
+        if (self.keys[slot] is None or self.generations[slot] != self.generation
+                or self.depths[slot] <= depth):
+            self.keys[slot] = key
+            self.values[slot] = value
+            self.depths[slot] = depth
+            self.generations[slot] = self.generation
+
+    def new_search(self):
+        self.generation += 1
+
+    def invalidate(self):
+        self.epoch = (self.epoch + 1) & 0xFFFF
+
+    def clear(self):
+        self.keys = [None] * self.size
+        self.values = [0.0] * self.size
+        self.depths = [0] * self.size
+        self.generations = [0] * self.size
+
+
+def fighter_from_character(character, special_chance=1.0):
+    return Fighter(character.name, {
+        'health': character.max_health,
+        'attack': character.attack,
+        'defense': character.base_value('defense'),
+        'crit_chance': character.base_value('crit_chance')
+    }, special_chance)
+
+
+class ExpectimaxEnemy:
+    def __init__(self, max_depth=8, time_budget_ms=8, table_bits=18):
+        self.max_depth = max_depth
+        self.time_budget = time_budget_ms / 1000
+        self.table = TranspositionTable(table_bits)
+        self.signature = None
+        self.hero = None
+        self.foe = None
+        self.deadline = 0
+        self.last_depth = 0
+
+    def choose_action(self, battle):
+        player, enemy = battle.player, battle.enemy
+        if enemy.special_cooldown > 0:
+            return 'attack'
+        self.deadline = time.perf_counter() + self.time_budget
+        self._prepare(player, enemy)
+        state = state_from_characters(player, enemy)
+        self.table.new_search()
+        best = 'attack'
+        for depth in range(1, self.max_depth + 1):
+            try:
+                attack = self._enemy_value(state, False, depth)
+                special = self._enemy_value(state, True, depth)
+            except SearchTimeout:
+                break
+            best = 'special' if special > attack else 'attack'
+            self.last_depth = depth
+        return best
+
+    def _prepare(self, player, enemy):
+        hero = fighter_from_character(player)
+        foe = fighter_from_character(enemy)
+        signature = (hero.class_name, hero.max_health, hero.attack, hero.defense, hero.crit_chance,
+                     foe.class_name, foe.max_health, foe.attack, foe.defense, foe.crit_chance)
+        if signature != self.signature:
+            self.signature = signature
+            self.hero = hero
+            self.foe = foe
+            self.table.invalidate()
+
+    def _player_node(self, state, depth):
+        if depth == 0:
+            return self._evaluate(state)
+        key = (pack(state) << 6 | depth) << 1
+        value = self.table.get(key)
+        if value is not None:
+            return value
+        if time.perf_counter() > self.deadline:
+            raise SearchTimeout()
+
+        hero, foe = self.hero, self.foe
+        p_hp, e_hp, p_cd, e_cd, p_boost, e_boost, p_bless, e_bless, p_burn, e_burn = state
+        value = 1.0
+        for special in ((False, True) if p_cd == 0 else (False,)):
+            expected = 0.0
+            for p, (p_hp1, e_hp1, p_cd1, p_boost1, p_bless1, e_lit) in hero.outcomes(
+                    special, p_hp, e_hp, p_cd, p_boost, p_bless, foe, e_boost, e_bless):
+                if e_hp1 <= 0:
+                    continue
+                mid = (p_hp1, e_hp1, p_cd1, e_cd, p_boost1, e_boost, p_bless1, e_bless,
+                       p_burn, BURN_DURATION if e_lit else e_burn)
+                expected += p * self._enemy_node(mid, depth)
+            value = min(value, expected)
+        self.table.put(key, value, depth)
+        return value
+
+    def _enemy_node(self, state, depth):
+        key = (pack(state) << 6 | depth) << 1 | 1
+        value = self.table.get(key)
+        if value is not None:
+            return value
+        value = self._enemy_value(state, False, depth)
+        if state[3] == 0:
+            value = max(value, self._enemy_value(state, True, depth))
+        self.table.put(key, value, depth)
+        return value
+
+    def _enemy_value(self, state, special, depth):
+        hero, foe = self.hero, self.foe
+        p_hp, e_hp, p_cd, e_cd, p_boost, e_boost, p_bless, e_bless, p_burn, e_burn = state
+        expected = 0.0
+        for p, (e_hp2, p_hp2, e_cd2, e_boost2, e_bless2, p_lit) in foe.outcomes(
+                special, e_hp, p_hp, e_cd, e_boost, e_bless, hero, p_boost, p_bless):
+            if p_hp2 <= 0:
+                expected += p
+                continue
+            acted = (p_hp2, e_hp2, p_cd, e_cd2, p_boost, e_boost2, p_bless, e_bless2,
+                     BURN_DURATION if p_lit else p_burn, e_burn)
+            for q, after in end_turn(hero, foe, acted):
+                if after is None:
+                    expected += p * q
+                elif after != WIN:
+                    expected += p * q * self._player_node(after, depth - 1)
+        return expected
+
+    def _evaluate(self, state):
+        p_hp, e_hp = state[0], state[1]
+        return 0.5 + 0.5 * (e_hp / self.foe.max_health - p_hp / self.hero.max_health)
@@ -0,0 +1,203 @@
+import math
+import random
+import threading
+import time
+
+from src.ai.expectimax import fighter_from_character
+from src.simulation.solver import end_turn, pack, state_from_characters, ENEMY_SPECIAL_CHANCE, WIN
+from src.utils.constants import BURN_DURATION
+
+
+class _DecisionNode:
+    __slots__ = ('key', 'state', 'enemy', 'visits', 'children')
+
+    def __init__(self, state, enemy):
+        self.key = pack(state) << 1 | enemy
+        self.state = state
+        self.enemy = enemy
+        self.visits = 0
+        self.children = {}
+
+
+class _ActionNode:
+    __slots__ = ('visits', 'value', 'outcomes')
+
+    def __init__(self):
+        self.visits = 0
+        self.value = 0.0
+        self.outcomes = {}
+
+
+class MCTSEnemy:
+    def __init__(self, time_budget_ms=150, exploration=1.4, rollout_turns=40, seed=None):
+        self.time_budget = time_budget_ms / 1000
+        self.exploration = exploration
+        self.rollout_turns = rollout_turns
+        self.rng = random.Random(seed)
+        self.root = None
+        self.signature = None
+        self.hero = None
+        self.foe = None
+        self.thread = None
+        self.stop_event = threading.Event()
+        self.iterations = 0
+
+    def start_thinking(self, battle):
+        self.stop()
+        root = self._root_for(battle)
+        self.stop_event.clear()
+        self.thread = threading.Thread(
+            target=self._search, args=(root, time.perf_counter() + self.time_budget), daemon=True
+        )
+        self.thread.start()
+
+    def stop(self):
+        if self.thread is not None:
+            self.stop_event.set()
+            self.thread.join()
+            self.thread = None
+
+    def choose_action(self, battle):
+        if self.thread is None:
+            self._search(self._root_for(battle), time.perf_counter() + self.time_budget)
+        else:
+            self.stop()
+        if not self.root.children:
+            return 'attack'
+        special = max(self.root.children, key=lambda a: self.root.children[a].visits)
+        return 'special' if special else 'attack'
+
+    def _root_for(self, battle):
+        player, enemy = battle.player, battle.enemy
+        hero = fighter_from_character(player)
+        foe = fighter_from_character(enemy)
+        signature = (hero.class_name, hero.max_health, hero.attack, hero.defense, hero.crit_chance,
+                     foe.class_name, foe.max_health, foe.attack, foe.defense, foe.crit_chance)
+        if signature != self.signature:
+            self.signature = signature
+            self.hero = hero
+            self.foe = foe
+            self.root = None
+        node = _DecisionNode(state_from_characters(player, enemy), 1)
+        self.root = self._find(self.root, node.key) or node
+        return self.root
+
+    def _find(self, root, key, depth=4):
+        level = [root] if root is not None else []
+        for _ in range(depth + 1):
+            following = []
+            for node in level:
+                if node.key == key:
+                    return node
+                for action in node.children.values():
+                    following.extend(action.outcomes.values())
+            level = following
+        return None
+
+    def _search(self, root, deadline):
+        iterations = 0
+        while not self.stop_event.is_set() and time.perf_counter() < deadline:
+            self._iterate(root)
+            iterations += 1
+            if iterations % 32 == 0:
+                time.sleep(0)
+        self.iterations = iterations
+
+    def _iterate(self, root):
+        node = root
+        path = []
+        while True:
+            actions = (False, True) if node.state[3 if node.enemy else 2] == 0 else (False,)
+            untried = [action for action in actions if action not in node.children]
+            if untried:
+                special = untried[0]
+                node.children[special] = _ActionNode()
+            else:
+                special = self._select(node)
+            child = node.children[special]
+            path.append((node, child))
+            value, following = self._step(node, special)
+            if following is None:
+                break
+            next_node = child.outcomes.get(following.key)
+            if next_node is None:
+                child.outcomes[following.key] = following
+                value = self._rollout(following)
+                break
+            node = next_node
+        for node, child in path:
+            node.visits += 1
+            child.visits += 1
+            child.value += value
+
+    def _select(self, node):
+        log_visits = math.log(node.visits + 1)
+        best, best_score = False, -1.0
+        for special, child in node.children.items():
+            mean = child.value / child.visits
+            if not node.enemy:
+                mean = 1.0 - mean
+            score = mean + self.exploration * math.sqrt(log_visits / child.visits)
+            if score > best_score:
+                best, best_score = special, score
+        return best
+
+    def _step(self, node, special):
+        if node.enemy:
+            result = self._enemy_turn(node.state, special)
+            if isinstance(result, float):
+                return result, None
+            return 0.0, _DecisionNode(result, 0)
+        result = self._player_turn(node.state, special)
+        if isinstance(result, float):
+            return result, None
+        return 0.0, _DecisionNode(result, 1)
+
+    def _player_turn(self, state, special):
+        p_hp, e_hp, p_cd, e_cd, p_boost, e_boost, p_bless, e_bless, p_burn, e_burn = state
+        p_hp1, e_hp1, p_cd1, p_boost1, p_bless1, e_lit = self._pick(self.hero.outcomes(
+            special, p_hp, e_hp, p_cd, p_boost, p_bless, self.foe, e_boost, e_bless))
+        if e_hp1 <= 0:
+            return 0.0
+        return (p_hp1, e_hp1, p_cd1, e_cd, p_boost1, e_boost, p_bless1, e_bless,
+                p_burn, BURN_DURATION if e_lit else e_burn)
+
+    def _enemy_turn(self, state, special):
+        hero, foe = self.hero, self.foe
+        p_hp, e_hp, p_cd, e_cd, p_boost, e_boost, p_bless, e_bless, p_burn, e_burn = state
+        e_hp2, p_hp2, e_cd2, e_boost2, e_bless2, p_lit = self._pick(foe.outcomes(
+            special, e_hp, p_hp, e_cd, e_boost, e_bless, hero, p_boost, p_bless))
+        if p_hp2 <= 0:
+            return 1.0
+        after = self._pick(end_turn(hero, foe, (p_hp2, e_hp2, p_cd, e_cd2, p_boost, e_boost2, p_bless,
+                                                e_bless2, BURN_DURATION if p_lit else p_burn, e_burn)))
+        if after == WIN:
+            return 0.0
+        if after is None:
+            return 1.0
+        return after
+
+    def _rollout(self, node):
+        state, enemy = node.state, node.enemy
+        for _ in range(self.rollout_turns):
+            if not enemy:
+                result = self._player_turn(state, state[2] == 0)
+                if isinstance(result, float):
+                    return result
+                state = result
+            special = state[3] == 0 and self.rng.random() < ENEMY_SPECIAL_CHANCE
+            result = self._enemy_turn(state, special)
+            if isinstance(result, float):
+                return result
+            state, enemy = result, 0
+        return 0.5 + 0.5 * (state[1] / self.foe.max_health - state[0] / self.hero.max_health)
+
+    def _pick(self, outcomes):
+        roll = self.rng.random()
+        chosen = None
+        for p, outcome in outcomes:
+            chosen = outcome
+            roll -= p
+            if roll < 0:
+                break
+        return chosen
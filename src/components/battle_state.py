@@ -0,0 +1,80 @@
+from collections import namedtuple
+
+from src.components.battle_system import BattleSystem
+from src.components.character import Character
+from src.components.class_registry import EFFECTS
+
+FighterState = namedtuple('FighterState', 'health special_cooldown growth_levels level xp')
+BattleState = namedtuple('BattleState', 'turn effect_turn positions player enemy effects inputs log_total')
+
+
+def fighter_state(character, previous=None):
+    level_system = character.level_system
+    state = FighterState(character.health, character.special_cooldown, character.growth_levels, level_system.level,
+                         level_system.xp)
+    return previous if state == previous else state
+
+
+def capture(battle, previous=None):
+    random = battle.random
+    sides = (battle.player, battle.enemy)
+    effects = tuple((sides.index(effect.target), effect.name, effect.expires_at, effect.due)
+                    for effect in battle.effects.pending())
+    if previous is not None and effects == previous.effects:
+        effects = previous.effects
+    return BattleState(
+        battle.current_turn, battle.effects.turn,
+        (random.gameplay.tell(), random.decisions.tell(), random.cosmetic.tell()),
+        fighter_state(battle.player, previous and previous.player),
+        fighter_state(battle.enemy, previous and previous.enemy),
+        effects, len(battle.inputs), battle.combat_log.total if battle.combat_log is not None else 0
+    )
+
+
+def apply(battle, state):
+    sides = (battle.player, battle.enemy)
+    for character, fighter in zip(sides, (state.player, state.enemy)):
+        character.clear_effects()
+        character.level_up_stats(fighter.growth_levels - character.growth_levels)
+        character.level_system.set_level(fighter.level, fighter.xp)
+        character.health = fighter.health
+        character.special_cooldown = fighter.special_cooldown
+    battle.current_turn = state.turn
+    battle.effects.turn = state.effect_turn
+    for stream, position in zip((battle.random.gameplay, battle.random.decisions, battle.random.cosmetic),
+                                state.positions):
+        stream.seek(position)
+    for side, name, expires_at, due in state.effects:
+        EFFECTS[name]().restore(sides[side], battle.effects, expires_at, due)
+    del battle.inputs[state.inputs:]
+    if battle.combat_log is not None:
+        battle.combat_log.rewind(state.log_total)
+
+
+def fork(battle, state=None, seed=None):
+    player = Character(battle.player.name, battle.player.base_stats)
+    enemy = Character(battle.enemy.name, battle.enemy.base_stats)
+    branch = BattleSystem(player, enemy, battle.xp_reward, seed=battle.seed if seed is None else seed, log=False)
+    branch.inputs.extend(battle.inputs)
+    apply(branch, state or capture(battle))
+    return branch
+
+
+class History:
+    def __init__(self):
+        self.states = []
+
+    def __len__(self):
+        return len(self.states)
+
+    def push(self, battle):
+        self.states.append(capture(battle, self.states[-1] if self.states else None))
+
+    def undo(self, battle):
+        if not self.states:
+            return False
+        apply(battle, self.states.pop())
+        return True
+
+    def clear(self):
+        self.states.clear()
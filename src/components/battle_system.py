@@ -0,0 +1,129 @@
+from src.components.combat_events import (
+    ATTACK, DEFEAT, EFFECT_TICK, LEVEL_UP, SPECIAL, TURN, CombatLog, EventBus
+)
+from src.components.effect_scheduler import EffectScheduler
+from src.utils.rng import BattleRandom
+
+class BattleSystem:
+    def __init__(self, player, enemy, xp_reward=50, enemy_policy=None, seed=None, log=True):
+        self.player = player
+        self.enemy = enemy
+        self.xp_reward = xp_reward
+        self.enemy_policy = enemy_policy
+        self.events = EventBus()
+        self.combat_log = None
+        if log:
+            self.combat_log = CombatLog()
+            self.events.subscribe(self.combat_log.record)
+        self.current_turn = 0
+        self.effects = EffectScheduler()
+        self.random = BattleRandom(seed)
+        self.seed = self.random.seed
+        self.inputs = []
+        self._record_lineup()
+        for character in (player, enemy):
+            self._join(character)
+
+    def _join(self, character):
+        character.clear_effects()
+        character.scheduler = self.effects
+        character.rng = self.random.gameplay
+        character.cosmetic = self.random.cosmetic
+        character.events = self.events
+
+    def _record_lineup(self):
+        self.lineup = tuple((character.name, character.growth_levels, character.level_system.level, character.health)
+                            for character in (self.player, self.enemy))
+
+    def next_wave(self, enemy, xp_reward):
+        self.enemy = enemy
+        self.xp_reward = xp_reward
+        self.current_turn = 0
+        self.inputs.clear()
+        self._record_lineup()
+        for character in (self.player, enemy):
+            self._join(character)
+
+    def execute_turn(self, action):
+        self.player_turn(action)
+        if self.enemy.is_alive():
+            self.enemy_turn()
+
+    def player_turn(self, action):
+        self.current_turn += 1
+        self.inputs.append(action)
+        self.events.emit(TURN, amount=self.current_turn)
+        if action == 'attack':
+            damage = self.player.attack
+            actual_damage, message = self.enemy.take_damage(damage)
+            self.events.emit(ATTACK, self.player, self.enemy, actual_damage, message)
+        elif action == 'special':
+            success, variant, amount, message = self.player.use_special_ability(self.enemy)
+            self.events.emit(SPECIAL, self.player, self.enemy, amount, message, variant)
+        if not self.enemy.is_alive():
+            self._defeat_enemy()
+        return action
+
+    def enemy_turn(self):
+        action = self._get_enemy_action()
+        self.inputs.append(action)
+        if action == 'special':
+            success, variant, amount, message = self.enemy.use_special_ability(self.player)
+            self.events.emit(SPECIAL, self.enemy, self.player, amount, message, variant)
+        else:
+            damage = self.enemy.attack
+            actual_damage, message = self.player.take_damage(damage)
+            self.events.emit(ATTACK, self.enemy, self.player, actual_damage, message)
+        self.player.update_cooldowns()
+        self.enemy.update_cooldowns()
+        if not self.player.is_alive():
+            self.events.emit(DEFEAT, self.player)
+        else:
+            self.end_turn()
+        return action
+
+    def end_turn(self):
+        for effect, damage in self.effects.advance():
+            self.events.emit(EFFECT_TICK, effect.target, amount=damage, variant=effect.name)
+        if not self.enemy.is_alive():
+            self._defeat_enemy()
+        elif not self.player.is_alive():
+            self.events.emit(DEFEAT, self.player)
+
+    def _defeat_enemy(self):
+        if self.player.gain_xp(self.xp_reward):
+            self.events.emit(LEVEL_UP, self.player, amount=self.player.level_system.level)
+        self.events.emit(DEFEAT, self.enemy)
+
+    def _get_enemy_action(self):
+        if self.enemy_policy is not None:
+            return self.enemy_policy.choose_action(self)
+        if self.random.decisions.random() < 0.3 and self.enemy.special_cooldown == 0:
+            return 'special'
+        return 'attack'
+
+    def is_battle_over(self):
+        return not self.player.is_alive() or not self.enemy.is_alive()
+
+    def get_combat_log(self):
+        if self.combat_log is None:
+            return []
+        return self.combat_log.tail(5)
+
+
+class ScriptedPolicy:
+    def __init__(self, actions):
+        self.actions = iter(actions)
+
+    def choose_action(self, battle):
+        return next(self.actions)
+
+
+def replay_battle(player, enemy, seed, inputs, xp_reward=50, log=True):
+    script = ScriptedPolicy(inputs)
+    battle = BattleSystem(player, enemy, xp_reward, script, seed, log)
+    for action in script.actions:
+        battle.execute_turn(action)
+        if battle.is_battle_over():
+            break
+    return battle
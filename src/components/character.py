@@ -1,143 +1,138 @@
-import random
-import math
-
-import pygame
-from src.components.character_sprite import CharacterSprite
+from src.components.class_registry import get_class
+from src.components.combat_events import CRIT, DODGE, IDLE_BUS
+from src.components.effect_scheduler import EffectScheduler
 from src.components.level_system import LevelSystem
-from src.components.status_effect import StatusEffect
-from src.utils.constants import BURN_COLOR, BLESS_COLOR
+from src.utils.rng import DEFAULT_RANDOM
+
+BASE_STATS = {'health': 0, 'attack': 0, 'defense': 0, 'crit_chance': 0.1, 'dodge_chance': 0.05}
+
+
+class DerivedStat:
+    def __init__(self, stat):
+        self.stat = stat
+
+    def __get__(self, character, owner):
+        if character is None:
+            return self
+        stats = character._stats
+        if stats is None:
+            stats = character._refresh_stats()
+        return stats[self.stat]
+
+    def __set__(self, character, value):
+        raise AttributeError(f"{self.stat} is derived; change base_stats or add a modifier")
+
 
 class Character:
+    max_health = DerivedStat('health')
+    attack = DerivedStat('attack')
+    defense = DerivedStat('defense')
+    crit_chance = DerivedStat('crit_chance')
+    dodge_chance = DerivedStat('dodge_chance')
+
     def __init__(self, name, stats):
         self.name = name
-        self.max_health = stats['health']
-        self.health = stats['health']
-        self.attack = stats['attack']
-        self.defense = stats['defense']
+        self.character_class = get_class(name, stats)
+        self.base_stats = dict(BASE_STATS, **stats)
+        self.growth_levels = 0
+        self.modifiers = {}
+        self.stats_version = 0
+        self._stats = None
+        self.health = self.max_health
         self.special_cooldown = 0
         self.max_special_cooldown = 3
-        self.sprite = CharacterSprite(name, name != "Enemy")
-        self.particles = []
         self.effects = []
-        self.stealth = False
-        self.stealth_timer = 0
-        self.crit_chance = 0.1
-        self.dodge_chance = 0.05
+        self.scheduler = EffectScheduler()
         self.level_system = LevelSystem()
-        self.base_stats = stats.copy()
-
-    def level_up_stats(self):
-        if self.name == "Warrior":
-            self.max_health += 15
-            self.attack += 2
-            self.defense += 2
-        elif self.name == "Mage":
-            self.max_health += 8
-            self.attack += 3
-            self.defense += 1
-        elif self.name == "Archer":
-            self.max_health += 10
-            self.attack += 2
-            self.defense += 1
-        elif self.name == "Rogue":
-            self.max_health += 8
-            self.attack += 2
-            self.defense += 1
-            self.crit_chance += 0.02
-        elif self.name == "Paladin":
-            self.max_health += 12
-            self.attack += 1
-            self.defense += 2
-        
+        self.rng = DEFAULT_RANDOM.gameplay
+        self.cosmetic = DEFAULT_RANDOM.cosmetic
+        self.events = IDLE_BUS
+        self.hero_id = None
+        self.view = None
+
+    def reset(self, stats, level=1):
+        self.clear_effects()
+        self.base_stats = dict(BASE_STATS, **stats)
+        self.growth_levels = 0
+        self._stats = None
+        self.health = self.max_health
+        self.special_cooldown = 0
+        self.level_system.set_level(level)
+        if self.view is not None:
+            self.view.reset()
+
+    def level_up_stats(self, levels=1):
+        self.growth_levels += levels
+        self._stats = None
         self.health = self.max_health
         return True
 
+    def base_value(self, stat):
+        return self.base_stats[stat] + self.character_class.growth.get(stat, 0) * self.growth_levels
+
+    def add_modifier(self, source, values, override=False):
+        self.modifiers[source] = (values, override)
+        self._stats = None
+
+    def remove_modifier(self, source):
+        if self.modifiers.pop(source, None) is not None:
+            self._stats = None
+
+    def _refresh_stats(self):
+        stats = {stat: self.base_value(stat) for stat in BASE_STATS}
+        overrides = {}
+        for values, override in self.modifiers.values():
+            for stat, value in values.items():
+                if override:
+                    overrides[stat] = value
+                else:
+                    stats[stat] += value
+        stats.update(overrides)
+        self._stats = stats
+        self.stats_version += 1
+        return stats
+
     def update(self):
-        self.sprite.update()
-        self.update_particles()
-        self.update_effects()
-        if self.stealth:
-            self.stealth_timer -= 1
-            if self.stealth_timer <= 0:
-                self.stealth = False
-        self.level_system.update()
-
-    def update_effects(self):
-        for effect in self.effects[:]:
+        for effect in self.effects:
             effect.update()
-            if effect.duration <= 0:
-                self.effects.remove(effect)
-            else:
-                effect.apply(self)
 
     def add_effect(self, effect):
-        self.effects.append(effect)
-
-    def draw(self, screen):
-        self.sprite.draw(screen)
-        self.draw_particles(screen)
-        for effect in self.effects:
-            effect.draw_particles(screen, self.sprite.position)
-        self.level_system.draw(screen, self.sprite.position[0], self.sprite.position[1] - 50)
-
-    def add_particle(self, pos, color, velocity, lifetime):
-        self.particles.append({
-            'pos': list(pos),
-            'vel': list(velocity),
-            'color': color,
-            'lifetime': lifetime,
-            'max_lifetime': lifetime
-        })
-
-    def update_particles(self):
-        for particle in self.particles[:]:
-            particle['pos'][0] += particle['vel'][0]
-            particle['pos'][1] += particle['vel'][1]
-            particle['lifetime'] -= 1
-            if particle['lifetime'] <= 0:
-                self.particles.remove(particle)
-
-    def draw_particles(self, screen):
-        for particle in self.particles:
-            alpha = int((particle['lifetime'] / particle['max_lifetime']) * 255)
-            color = (*particle['color'], alpha)
-            pos = (int(particle['pos'][0]), int(particle['pos'][1]))
-            pygame.draw.circle(screen, color, pos, 2)
+        current = [existing for existing in self.effects if existing.name == effect.name]
+        if not current or (effect.stacking == 'stack' and len(current) < effect.max_stacks):
+            self.effects.append(effect)
+            effect.attach(self, self.scheduler)
+        elif effect.stacking in ('refresh', 'stack'):
+            current[0].refresh(effect.duration)
+        elif effect.stacking == 'extend':
+            current[0].extend(effect.duration)
+
+    def clear_effects(self):
+        for effect in self.effects[:]:
+            effect.expire()
+        if self.modifiers:
+            self.modifiers.clear()
+            self._stats = None
 
     def take_damage(self, damage):
-        if random.random() < self.dodge_chance:
+        if self.rng.random() < self.dodge_chance:
+            self.events.emit(DODGE, target=self)
             return 0, "DODGE!"
 
-        is_crit = random.random() < self.crit_chance
+        is_crit = self.rng.random() < self.crit_chance
         if is_crit:
             damage *= 1.5
+            self.events.emit(CRIT, target=self, amount=damage)
 
         actual_damage = max(1, damage - self.defense)
         self.health = max(0, self.health - actual_damage)
-        self.sprite.flash()
-        
-        for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            self.add_particle(
-                self.sprite.position,
-                (255, 0, 0),
-                [math.cos(angle) * speed, math.sin(angle) * speed],
-                30
-            )
+        if self.view is not None:
+            self.view.on_damaged()
         return actual_damage, "CRITICAL!" if is_crit else ""
 
     def heal(self, amount):
         self.health = min(self.max_health, self.health + amount)
-        for _ in range(10):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(1, 3)
-            self.add_particle(
-                self.sprite.position,
-                (0, 255, 0),
-                [math.cos(angle) * speed, math.sin(angle) * speed],
-                30
-            )
+        if self.view is not None:
+            self.view.on_healed()
         return amount
 
     def is_alive(self):
@@ -148,95 +143,23 @@ class Character:
 
     def use_special_ability(self, target):
         if self.special_cooldown > 0:
-            return False, "Special ability is on cooldown!"
+            return False, 'cooldown', 0, ""
 
         self.special_cooldown = self.max_special_cooldown
-        
-        if self.name == "Warrior":
-            damage = self.attack * 2
-            actual_damage, message = target.take_damage(damage)
-            for _ in range(20):
-                angle = random.uniform(0, 2 * math.pi)
-                speed = random.uniform(3, 6)
-                self.add_particle(
-                    self.sprite.position,
-                    (255, 100, 0),
-                    [math.cos(angle) * speed, math.sin(angle) * speed],
-                    40
-                )
-            return True, f"{self.name} uses Berserker Rage and deals {actual_damage} damage! {message}"
-            
-        elif self.name == "Mage":
-            damage = self.attack * 1.5
-            actual_damage, message = target.take_damage(damage)
-            for _ in range(20):
-                angle = random.uniform(0, 2 * math.pi)
-                speed = random.uniform(3, 6)
-                self.add_particle(
-                    self.sprite.position,
-                    (255, 200, 0),
-                    [math.cos(angle) * speed, math.sin(angle) * speed],
-                    40
-                )
-            if random.random() < 0.5:
-                target.add_effect(StatusEffect("Burn", 3, BURN_COLOR, 
-                    lambda t: t.take_damage(5)[0]))
-                return True, f"{self.name} casts Fireball dealing {actual_damage} damage and burns the target! {message}"
-            return True, f"{self.name} casts Fireball dealing {actual_damage} damage! {message}"
-            
-        elif self.name == "Archer":
-            damage = self.attack * 2.5
-            actual_damage, message = target.take_damage(damage)
-            for _ in range(20):
-                angle = random.uniform(-0.2, 0.2)
-                speed = random.uniform(5, 8)
-                self.add_particle(
-                    self.sprite.position,
-                    (200, 200, 200),
-                    [math.cos(angle) * speed, math.sin(angle) * speed],
-                    30
-                )
-            return True, f"{self.name} uses Precision Shot and deals {actual_damage} damage! {message}"
-
-        elif self.name == "Rogue":
-            self.stealth = True
-            self.stealth_timer = 2
-            self.crit_chance = 0.5
-            for _ in range(20):
-                angle = random.uniform(0, 2 * math.pi)
-                speed = random.uniform(1, 3)
-                self.add_particle(
-                    self.sprite.position,
-                    (128, 128, 128),
-                    [math.cos(angle) * speed, math.sin(angle) * speed],
-                    30
-                )
-            return True, f"{self.name} enters Stealth mode!"
-
-        elif self.name == "Paladin":
-            heal_amount = self.attack * 1.5
-            self.heal(heal_amount)
-            for _ in range(20):
-                angle = random.uniform(0, 2 * math.pi)
-                speed = random.uniform(2, 4)
-                self.add_particle(
-                    self.sprite.position,
-                    (255, 255, 200),
-                    [math.cos(angle) * speed, math.sin(angle) * speed],
-                    30
-                )
-            self.add_effect(StatusEffect("Blessed", 2, BLESS_COLOR,
-                lambda t: setattr(t, 'defense', t.defense + 5)))
-            return True, f"{self.name} uses Holy Light and heals for {heal_amount}!"
-
-        return False, "No special ability available!"
+        return self.character_class.use_special(self, target)
+
+    def _show_special(self):
+        if self.view is not None:
+            self.view.on_special()
 
     def update_cooldowns(self):
         if self.special_cooldown > 0:
             self.special_cooldown -= 1
 
     def gain_xp(self, amount):
-        if self.level_system.add_xp(amount):
-            self.level_up_stats()
-            return True
-        return False 
\ No newline at end of file
+        levels = self.level_system.add_xp(amount)
+        if levels > 0:
+            self.level_up_stats(levels)
+            if self.view is not None:
+                self.view.on_level_up(levels)
+        return levels
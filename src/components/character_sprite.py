@@ -1,6 +1,8 @@
 import pygame
 import math
 
+from src.components.class_registry import get_class
+
 class CharacterSprite:
     def __init__(self, character_type, is_player=True):
         self.type = character_type
@@ -18,18 +20,7 @@ class CharacterSprite:
 
     def create_sprite(self):
         self.sprite = pygame.Surface(self.size, pygame.SRCALPHA)
-        if self.type == "Warrior":
-            self.draw_warrior()
-        elif self.type == "Mage":
-            self.draw_mage()
-        elif self.type == "Archer":
-            self.draw_archer()
-        elif self.type == "Rogue":
-            self.draw_rogue()
-        elif self.type == "Paladin":
-            self.draw_paladin()
-        else: 
-            self.draw_enemy()
+        SPRITE_BUILDERS.get(get_class(self.type).sprite, CharacterSprite.draw_enemy)(self)
 
     def draw_warrior(self):
         pygame.draw.rect(self.sprite, (100, 100, 100), (40, 30, 20, 60))
@@ -100,4 +91,23 @@ class CharacterSprite:
             screen.blit(self.sprite, self.position)
 
     def flash(self):
-        self.flash_timer = 10 
\ No newline at end of file
+        self.flash_timer = 10
+
+    def reset(self):
+        self.position = self.target_position.copy()
+        self.animation_frame = 0
+        self.animation_timer = 0
+        self.is_attacking = False
+        self.attack_progress = 0
+        self.flash_timer = 0
+        self.stealth_alpha = 255
+
+
+SPRITE_BUILDERS = {
+    'warrior': CharacterSprite.draw_warrior,
+    'mage': CharacterSprite.draw_mage,
+    'archer': CharacterSprite.draw_archer,
+    'rogue': CharacterSprite.draw_rogue,
+    'paladin': CharacterSprite.draw_paladin,
+    'enemy': CharacterSprite.draw_enemy
+}
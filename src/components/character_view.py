@@ -0,0 +1,166 @@
+import math
+
+import pygame
+from src.components.character_sprite import CharacterSprite
+from src.utils.constants import YELLOW, WHITE
+
+LEVEL_UP_PARTICLES = 30
+MAX_LEVEL_UP_PARTICLES = 60
+MAX_PARTICLES = 200
+STAT_LINE_SPACING = 30
+STAT_SHADOW = 2
+
+class CharacterView:
+    font = None
+
+    def __init__(self, character):
+        self.character = character
+        self.sprite = CharacterSprite(character.name, character.character_class.playable)
+        self.particles = []
+        self.level_up_animation = 0
+        self.level_up_particles = []
+        self.stat_version = None
+        self.stat_surface = None
+        if CharacterView.font is None:
+            CharacterView.font = pygame.font.Font(None, 24)
+        character.view = self
+
+    def reset(self):
+        self.sprite.reset()
+        self.particles.clear()
+        self.level_up_animation = 0
+        self.level_up_particles.clear()
+
+    def stat_label(self, font, color):
+        lines = (f"Attack: {self.character.attack}", f"Defense: {self.character.defense}")
+        if self.stat_version != self.character.stats_version:
+            self.stat_version = self.character.stats_version
+            shadows = [font.render(line, True, (0, 0, 0)) for line in lines]
+            width = max(shadow.get_width() for shadow in shadows) + STAT_SHADOW
+            height = STAT_LINE_SPACING * (len(lines) - 1) + shadows[-1].get_height() + STAT_SHADOW
+            self.stat_surface = pygame.Surface((width, height), pygame.SRCALPHA)
+            for row, (line, shadow) in enumerate(zip(lines, shadows)):
+                y = row * STAT_LINE_SPACING
+                self.stat_surface.blit(shadow, (STAT_SHADOW, y + STAT_SHADOW))
+                self.stat_surface.blit(font.render(line, True, color), (0, y))
+        return self.stat_surface
+
+    def on_damaged(self):
+        self.sprite.flash()
+        self.burst(10, (255, 0, 0), (0, 2 * math.pi), (2, 5), 30)
+
+    def on_healed(self):
+        self.burst(10, (0, 255, 0), (0, 2 * math.pi), (1, 3), 30)
+
+    def on_special(self):
+        preset = self.character.character_class.particles
+        if preset is not None:
+            self.burst(20, *preset)
+
+    def on_level_up(self, levels=1):
+        self.level_up_animation = 60
+        rng = self.character.cosmetic
+        count = min(LEVEL_UP_PARTICLES * levels, MAX_LEVEL_UP_PARTICLES)
+        del self.level_up_particles[:max(0, len(self.level_up_particles) + count - MAX_LEVEL_UP_PARTICLES)]
+        for _ in range(count):
+            angle = rng.uniform(0, 2 * math.pi)
+            speed = rng.uniform(2, 5)
+            self.level_up_particles.append({
+                'pos': [0, 0],
+                'vel': [math.cos(angle) * speed, math.sin(angle) * speed],
+                'lifetime': rng.randint(30, 60),
+                'max_lifetime': 60
+            })
+
+    def burst(self, count, color, angle_range, speed_range, lifetime):
+        rng = self.character.cosmetic
+        del self.particles[:max(0, len(self.particles) + count - MAX_PARTICLES)]
+        for _ in range(count):
+            angle = rng.uniform(*angle_range)
+            speed = rng.uniform(*speed_range)
+            self.add_particle(
+                self.sprite.position,
+                color,
+                [math.cos(angle) * speed, math.sin(angle) * speed],
+                lifetime
+            )
+
+    def add_particle(self, pos, color, velocity, lifetime):
+        self.particles.append({
+            'pos': list(pos),
+            'vel': list(velocity),
+            'color': color,
+            'lifetime': lifetime,
+            'max_lifetime': lifetime
+        })
+
+    def update(self):
+        self.sprite.update()
+        self.update_particles()
+        if self.level_up_animation > 0:
+            self.level_up_animation -= 1
+            for particle in self.level_up_particles[:]:
+                particle['pos'][0] += particle['vel'][0]
+                particle['pos'][1] += particle['vel'][1]
+                particle['lifetime'] -= 1
+                if particle['lifetime'] <= 0:
+                    self.level_up_particles.remove(particle)
+
+    def update_particles(self):
+        for particle in self.particles[:]:
+            particle['pos'][0] += particle['vel'][0]
+            particle['pos'][1] += particle['vel'][1]
+            particle['lifetime'] -= 1
+            if particle['lifetime'] <= 0:
+                self.particles.remove(particle)
+
+    def draw(self, screen):
+        self.sprite.draw(screen)
+        self.draw_particles(screen)
+        for effect in self.character.effects:
+            self.draw_effect_particles(screen, effect, self.sprite.position)
+        self.draw_level_bar(screen, self.sprite.position[0], self.sprite.position[1] - 50)
+
+    def draw_particles(self, screen):
+        for particle in self.particles:
+            alpha = int((particle['lifetime'] / particle['max_lifetime']) * 255)
+            color = (*particle['color'], alpha)
+            pos = (int(particle['pos'][0]), int(particle['pos'][1]))
+            pygame.draw.circle(screen, color, pos, 2)
+
+    def draw_effect_particles(self, screen, effect, pos):
+        for particle in effect.particles:
+            alpha = int((particle['lifetime'] / particle['max_lifetime']) * 255)
+            color = (*effect.color, alpha)
+            pygame.draw.circle(screen, color,
+                             (int(pos[0] + particle['offset'][0]),
+                              int(pos[1] + particle['offset'][1])),
+                             2)
+
+    def draw_level_bar(self, screen, x, y):
+        level_system = self.character.level_system
+        bar_width = 200
+        bar_height = 20
+        xp_percent = level_system.xp / level_system.xp_to_next_level
+
+        pygame.draw.rect(screen, (50, 50, 50), (x, y, bar_width, bar_height), border_radius=10)
+        if xp_percent > 0:
+            fill_width = int(bar_width * xp_percent)
+            pygame.draw.rect(screen, YELLOW, (x, y, fill_width, bar_height), border_radius=10)
+        pygame.draw.rect(screen, WHITE, (x, y, bar_width, bar_height), 2, border_radius=10)
+
+        level_text = f"Level {level_system.level}"
+        text_surface = self.font.render(level_text, True, WHITE)
+        screen.blit(text_surface, (x + bar_width + 10, y))
+
+        xp_text = f"XP: {level_system.xp}/{level_system.xp_to_next_level}"
+        text_surface = self.font.render(xp_text, True, WHITE)
+        screen.blit(text_surface, (x, y - 25))
+
+        if self.level_up_animation > 0:
+            for particle in self.level_up_particles:
+                alpha = int((particle['lifetime'] / particle['max_lifetime']) * 255)
+                color = (*YELLOW, alpha)
+                pos = (int(x + bar_width/2 + particle['pos'][0]),
+                      int(y + bar_height/2 + particle['pos'][1]))
+                pygame.draw.circle(screen, color, pos, 3)
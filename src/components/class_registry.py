@@ -0,0 +1,149 @@
+import json
+import math
+import os
+
+from src.components.status_effect import StatusEffect
+from src.utils.constants import (
+    BURN_COLOR, BLESS_COLOR, STEALTH_COLOR, BURN_CHANCE, BURN_DAMAGE, BURN_DURATION, BLESS_DEFENSE, BLESS_DURATION,
+    STEALTH_DURATION
+)
+
+CLASSES_PATH = os.path.join(os.path.dirname(os.path.dirname(__file__)), "data", "classes.json")
+FULL_CIRCLE = (0, 2 * math.pi)
+BODY_ART = (" /|\\ ", " / \\ ")
+STEALTH_MODIFIER = {'crit_chance': 0.5}
+
+
+def burn_tick(target):
+    return target.take_damage(BURN_DAMAGE)[0]
+
+
+def burn_effect():
+    return StatusEffect("Burn", BURN_DURATION, BURN_COLOR, burn_tick)
+
+
+def blessed_effect():
+    return StatusEffect("Blessed", BLESS_DURATION, BLESS_COLOR, modifiers={'defense': BLESS_DEFENSE})
+
+
+def stealth_effect():
+    return StatusEffect("Stealth", STEALTH_DURATION, STEALTH_COLOR, modifiers=STEALTH_MODIFIER, override=True)
+
+
+EFFECTS = {
+    'Burn': burn_effect,
+    'Blessed': blessed_effect,
+    'Stealth': stealth_effect
+}
+
+
+def strike(character, target, character_class):
+    actual_damage, message = target.take_damage(character.attack * character_class.multiplier)
+    character._show_special()
+    return True, 'strike', actual_damage, message
+
+
+def fireball(character, target, character_class):
+    actual_damage, message = target.take_damage(character.attack * character_class.multiplier)
+    character._show_special()
+    if character.rng.random() < BURN_CHANCE:
+        target.add_effect(burn_effect())
+        return True, 'fireball_burn', actual_damage, message
+    return True, 'fireball', actual_damage, message
+
+
+def stealth(character, target, character_class):
+    character.add_effect(stealth_effect())
+    character._show_special()
+    return True, 'stealth', 0, ""
+
+
+def holy_light(character, target, character_class):
+    heal_amount = character.attack * character_class.multiplier
+    character.heal(heal_amount)
+    character._show_special()
+    character.add_effect(blessed_effect())
+    return True, 'holy_light', heal_amount, ""
+
+
+def no_ability(character, target, character_class):
+    return False, 'none', 0, ""
+
+
+ABILITIES = {
+    'strike': strike,
+    'fireball': fireball,
+    'stealth': stealth,
+    'holy_light': holy_light,
+    'none': no_ability
+}
+
+SPECIAL_MESSAGES = {
+    'strike': lambda e: f"{e.actor.name} uses {e.actor.character_class.title} and deals {e.amount} damage! {e.hit}",
+    'fireball': lambda e: f"{e.actor.name} casts {e.actor.character_class.title} dealing {e.amount} damage! {e.hit}",
+    'fireball_burn': lambda e: (f"{e.actor.name} casts {e.actor.character_class.title} dealing {e.amount} damage "
+                                f"and burns the target! {e.hit}"),
+    'stealth': lambda e: f"{e.actor.name} enters {e.actor.character_class.title} mode!",
+    'holy_light': lambda e: f"{e.actor.name} uses {e.actor.character_class.title} and heals for {e.amount}!",
+    'none': lambda e: "No special ability available!",
+    'cooldown': lambda e: "Special ability is on cooldown!"
+}
+
+
+class CharacterClass:
+    def __init__(self, name, data):
+        special = data.get('special', {})
+        particles = data.get('particles')
+        self.name = name
+        self.stats = data['stats']
+        self.growth = data.get('growth', {})
+        self.playable = data.get('playable', True)
+        self.ability = special.get('ability', 'none')
+        self.special = ABILITIES[self.ability]
+        self.title = special.get('title', "")
+        self.multiplier = special.get('multiplier', 1)
+        self.particles = None
+        if particles is not None:
+            self.particles = (
+                tuple(particles['color']),
+                tuple(particles.get('angle', FULL_CIRCLE)),
+                tuple(particles['speed']),
+                particles['lifetime']
+            )
+        self.sprite = data.get('sprite', 'enemy')
+        self.icon = data.get('icon', "👾")
+        self.art = (f"  {self.icon}  ",) + BODY_ART
+        self.trail = data.get('trail')
+
+    def use_special(self, character, target):
+        return self.special(character, target, self)
+
+
+def load_classes(path=CLASSES_PATH):
+    with open(path, encoding="utf-8") as f:
+        data = json.load(f)
+    return {name: CharacterClass(name, entry) for name, entry in data.items()}
+
+
+def register_classes(path):
+    for name, character_class in load_classes(path).items():
+        CLASSES[name] = character_class
+        CHARACTER_STATS[name] = character_class.stats
+        if character_class.growth:
+            LEVEL_UP_GROWTH[name] = character_class.growth
+        if character_class.playable and name not in PLAYER_CLASSES:
+            PLAYER_CLASSES.append(name)
+
+
+def get_class(name, stats=None):
+    character_class = CLASSES.get(name)
+    if character_class is None:
+        character_class = CharacterClass(name, {'stats': stats or {}})
+    return character_class
+
+
+CLASSES = {}
+CHARACTER_STATS = {}
+LEVEL_UP_GROWTH = {}
+PLAYER_CLASSES = []
+register_classes(CLASSES_PATH)
@@ -0,0 +1,98 @@
+from collections import deque
+
+from src.components.class_registry import SPECIAL_MESSAGES
+from src.utils.constants import LOG_CAPACITY
+
+TURN = 'turn'
+ATTACK = 'attack'
+SPECIAL = 'special'
+CRIT = 'crit'
+DODGE = 'dodge'
+EFFECT_TICK = 'effect_tick'
+DEFEAT = 'defeat'
+LEVEL_UP = 'level_up'
+VOLLEY = 'volley'
+NOTE = 'note'
+
+
+class CombatEvent:
+    __slots__ = ('kind', 'actor', 'target', 'amount', 'hit', 'variant')
+
+    def __init__(self, kind, actor=None, target=None, amount=0, hit="", variant=None):
+        self.kind = kind
+        self.actor = actor
+        self.target = target
+        self.amount = amount
+        self.hit = hit
+        self.variant = variant
+
+    def format(self):
+        return MESSAGES[self.kind](self)
+
+
+MESSAGES = {
+    TURN: lambda e: f"--- Turn {e.amount} ---",
+    ATTACK: lambda e: f"{e.actor.name} attacks for {e.amount} damage! {e.hit}",
+    SPECIAL: lambda e: SPECIAL_MESSAGES[e.variant](e),
+    EFFECT_TICK: lambda e: f"{e.actor.name} takes {e.amount} {e.variant} damage!",
+    DEFEAT: lambda e: f"{e.actor.name} has been defeated!",
+    LEVEL_UP: lambda e: f"{e.actor.name} leveled up to level {e.amount}!",
+    VOLLEY: lambda e: f"{e.actor} deal {e.amount:g} damage and defeat {e.variant}!",
+    NOTE: lambda e: e.variant
+}
+
+
+class EventBus:
+    def __init__(self):
+        self.subscribers = []
+
+    def subscribe(self, callback):
+        self.subscribers.append(callback)
+        return callback
+
+    def unsubscribe(self, callback):
+        if callback in self.subscribers:
+            self.subscribers.remove(callback)
+
+    def emit(self, kind, actor=None, target=None, amount=0, hit="", variant=None):
+        if not self.subscribers:
+            return None
+        event = CombatEvent(kind, actor, target, amount, hit, variant)
+        for callback in self.subscribers:
+            callback(event)
+        return event
+
+
+class CombatLog:
+    def __init__(self, capacity=LOG_CAPACITY):
+        self.events = deque(maxlen=capacity)
+        self.total = 0
+
+    def record(self, event):
+        if event.kind in MESSAGES:
+            self.events.append(event)
+            self.total += 1
+
+    def rewind(self, total):
+        while self.total > total and self.events:
+            self.events.pop()
+            self.total -= 1
+        self.total = total
+
+    def tail(self, count):
+        events = self.events
+        return [events[i].format() for i in range(max(0, len(events) - count), len(events))]
+
+    def __len__(self):
+        return len(self.events)
+
+    def __getitem__(self, index):
+        if isinstance(index, slice):
+            return [event.format() for event in list(self.events)[index]]
+        return self.events[index].format()
+
+    def __iter__(self):
+        return (event.format() for event in self.events)
+
+
+IDLE_BUS = EventBus()
@@ -0,0 +1,36 @@
+class EffectScheduler:
+    def __init__(self, slots=64):
+        self.slots = [[] for _ in range(slots)]
+        self.turn = 0
+
+    def schedule(self, effect, delay):
+        effect.due = self.turn + max(1, delay)
+        self.slots[effect.due % len(self.slots)].append((effect.due, effect))
+
+    def advance(self):
+        self.turn += 1
+        index = self.turn % len(self.slots)
+        bucket = self.slots[index]
+        self.slots[index] = later = []
+        due = []
+        for when, effect in bucket:
+            if when != effect.due:
+                continue
+            if when == self.turn:
+                due.append(effect)
+            else:
+                later.append((when, effect))
+
+        fired = []
+        for effect in due:
+            result = effect.tick()
+            if result is not None:
+                fired.append((effect, result))
+        for effect in due:
+            effect.settle(self)
+        return fired
+
+    def pending(self):
+        live = [(due, effect) for bucket in self.slots for due, effect in bucket if effect.due == due]
+        live.sort(key=lambda entry: entry[0])
+        return [effect for due, effect in live]
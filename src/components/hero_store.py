@@ -0,0 +1,212 @@
+import argparse
+import queue
+import sqlite3
+import threading
+import time
+
+import numpy as np
+from src.components.character import Character
+from src.components.class_registry import CHARACTER_STATS, PLAYER_CLASSES
+from src.components.roster import Roster
+
+BATCH_SIZE = 512
+LEADERBOARDS = {
+    'level': ('level', 'xp', 'id'),
+    'win_rate': ('win_rate', 'wins', 'id')
+}
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS heroes (
+    id INTEGER PRIMARY KEY,
+    class TEXT NOT NULL,
+    level INTEGER NOT NULL,
+    xp INTEGER NOT NULL,
+    growth_levels INTEGER NOT NULL,
+    max_health REAL NOT NULL,
+    attack REAL NOT NULL,
+    defense REAL NOT NULL,
+    crit_chance REAL NOT NULL,
+    wins INTEGER NOT NULL DEFAULT 0,
+    losses INTEGER NOT NULL DEFAULT 0,
+    win_rate REAL NOT NULL DEFAULT 0
+);
+CREATE INDEX IF NOT EXISTS heroes_by_level ON heroes (level DESC, xp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS heroes_by_class_level ON heroes (class, level DESC, xp DESC, id DESC);
+CREATE INDEX IF NOT EXISTS heroes_by_win_rate ON heroes (win_rate DESC, wins DESC, id DESC);
+CREATE INDEX IF NOT EXISTS heroes_by_class_win_rate ON heroes (class, win_rate DESC, wins DESC, id DESC);
+"""
+UPSERT = """
+INSERT INTO heroes (id, class, level, xp, growth_levels, max_health, attack, defense, crit_chance,
+                    wins, losses, win_rate)
+VALUES (?, ?, ?, ?, ?, ?, ?, ?, ?, ?, ?, CAST(?10 AS REAL) / MAX(1, ?10 + ?11))
+ON CONFLICT (id) DO UPDATE SET
+    level = excluded.level,
+    xp = excluded.xp,
+    growth_levels = excluded.growth_levels,
+    max_health = excluded.max_health,
+    attack = excluded.attack,
+    defense = excluded.defense,
+    crit_chance = excluded.crit_chance,
+    wins = wins + excluded.wins,
+    losses = losses + excluded.losses,
+    win_rate = CAST(wins + excluded.wins AS REAL) / MAX(1, wins + excluded.wins + losses + excluded.losses)
+"""
+
+
+def hero_row(character, won=None):
+    return (
+        character.hero_id, character.name, character.level_system.level, character.level_system.xp,
+        character.growth_levels, character.base_value('health'), character.base_value('attack'),
+        character.base_value('defense'), character.base_value('crit_chance'), 1 if won is True else 0,
+        1 if won is False else 0
+    )
+
+
+class HeroStore:
+    def __init__(self, path, batch_size=BATCH_SIZE):
+        self.path = path
+        self.batch_size = batch_size
+        self.connection = sqlite3.connect(path, check_same_thread=False)
+        self.connection.execute("PRAGMA journal_mode=WAL")
+        self.connection.executescript(SCHEMA)
+        self.next_id = (self.connection.execute("SELECT MAX(id) FROM heroes").fetchone()[0] or 0) + 1
+        self.writes = queue.Queue()
+        self.written = 0
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def allocate_ids(self, count=1):
+        start = self.next_id
+        self.next_id += count
+        return range(start, start + count)
+
+    def save(self, character, won=None):
+        if character.hero_id is None:
+            character.hero_id = self.allocate_ids()[0]
+        self.writes.put([hero_row(character, won)])
+
+    def save_rows(self, rows):
+        self.writes.put(list(rows))
+
+    def load_best(self, class_name):
+        row = self.connection.execute(
+            "SELECT id, level, xp, growth_levels FROM heroes WHERE class = ? "
+            "ORDER BY level DESC, xp DESC, id DESC LIMIT 1", (class_name,)
+        ).fetchone()
+        character = Character(class_name, CHARACTER_STATS[class_name])
+        if row is not None:
+            character.hero_id, level, xp, growth_levels = row
+            character.level_up_stats(growth_levels)
+            character.level_system.set_level(level, xp)
+        return character
+
+    def leaderboard(self, by='level', class_name=None, limit=20, after=None):
+        keys = LEADERBOARDS[by]
+        where = []
+        params = []
+        if class_name is not None:
+            where.append("class = ?")
+            params.append(class_name)
+        if after is not None:
+            where.append(f"({', '.join(keys)}) < ({', '.join('?' * len(keys))})")
+            params.extend(after)
+        query = ("SELECT id, class, level, xp, wins, losses, win_rate FROM heroes"
+                 + (" WHERE " + " AND ".join(where) if where else "")
+                 + f" ORDER BY {', '.join(key + ' DESC' for key in keys)} LIMIT ?")
+        rows = self.connection.execute(query, params + [limit]).fetchall()
+        columns = ('id', 'class', 'level', 'xp', 'wins', 'losses', 'win_rate')
+        entries = [dict(zip(columns, row)) for row in rows]
+        cursor = tuple(entries[-1][key] for key in keys) if entries else None
+        return entries, cursor
+
+    def flush(self):
+        self.writes.join()
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.writes.put(None)
+        self.thread.join()
+        self.thread = None
+        self.connection.close()
+
+    def _write_loop(self):
+        connection = sqlite3.connect(self.path)
+        while True:
+            batch = self.writes.get()
+            done = 1
+            rows = [] if batch is None else list(batch)
+            stop = batch is None
+            while not stop and len(rows) < self.batch_size:
+                try:
+                    batch = self.writes.get_nowait()
+                except queue.Empty:
+                    break
+                done += 1
+                if batch is None:
+                    stop = True
+                else:
+                    rows.extend(batch)
+            if rows:
+                with connection:
+                    connection.executemany(UPSERT, rows)
+                self.written += len(rows)
+            for _ in range(done):
+                self.writes.task_done()
+            if stop:
+                connection.close()
+                return
+
+
+def seed_heroes(store, count, seed=0):
+    rng = np.random.default_rng(seed)
+    roster = Roster(count)
+    per_class = count // len(PLAYER_CLASSES)
+    for name in PLAYER_CLASSES:
+        roster.add(name, per_class)
+    roster.grant_xp(rng.integers(1, 20000, len(roster)))
+    ids = store.allocate_ids(len(roster))
+    wins = rng.integers(0, 100, len(roster)).tolist()
+    losses = rng.integers(0, 100, len(roster)).tolist()
+    classes = roster['class_id'].tolist()
+    levels = roster['level'].tolist()
+    xp = roster['xp'].tolist()
+    columns = [roster[name].tolist() for name in ('max_health', 'attack', 'defense', 'crit_chance')]
+    store.save_rows(
+        (ids[i], roster.classes[classes[i]], levels[i], xp[i], levels[i] - 1,
+         columns[0][i], columns[1][i], columns[2][i], columns[3][i], wins[i], losses[i])
+        for i in range(len(roster))
+    )
+    store.flush()
+    return len(roster)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Persistent hero roster and leaderboards")
+    parser.add_argument("path")
+    parser.add_argument("--seed-heroes", type=int, default=0, help="add this many random heroes first")
+    parser.add_argument("--by", choices=sorted(LEADERBOARDS), default='level')
+    parser.add_argument("--class", dest="class_name", default=None)
+    parser.add_argument("--pages", type=int, default=3)
+    parser.add_argument("--page-size", type=int, default=10)
+    args = parser.parse_args()
+
+    store = HeroStore(args.path)
+    if args.seed_heroes:
+        start = time.perf_counter()
+        added = seed_heroes(store, args.seed_heroes)
+        print(f"Added {added} heroes in {time.perf_counter() - start:.2f}s")
+    cursor = None
+    for page in range(args.pages):
+        start = time.perf_counter()
+        entries, cursor = store.leaderboard(args.by, args.class_name, args.page_size, cursor)
+        print(f"Page {page + 1} ({(time.perf_counter() - start) * 1000:.2f} ms):")
+        for entry in entries:
+            print(f"  #{entry['id']} {entry['class']} level {entry['level']} ({entry['xp']} xp), "
+                  f"{entry['wins']}W/{entry['losses']}L, win rate {entry['win_rate']:.2f}")
+        if cursor is None:
+            break
+    store.close()
+
+
+if __name__ == "__main__":
+    main()
@@ -1,72 +1,59 @@
-import random
-import math
-import pygame
-from src.utils.constants import YELLOW, WHITE
+from bisect import bisect_right
+
+BASE_XP_TO_LEVEL = 100
+XP_GROWTH = 1.5
+PRECOMPUTED_LEVELS = 100
+
+XP_TO_NEXT = [BASE_XP_TO_LEVEL]
+LEVEL_START_XP = [0]
+
+
+def extend_curve(total_xp=0, levels=0):
+    while LEVEL_START_XP[-1] <= total_xp or len(LEVEL_START_XP) < levels:
+        LEVEL_START_XP.append(LEVEL_START_XP[-1] + XP_TO_NEXT[-1])
+        XP_TO_NEXT.append(int(XP_TO_NEXT[-1] * XP_GROWTH))
+
+
+def level_for_xp(total_xp):
+    if total_xp < LEVEL_START_XP[-1]:
+        return bisect_right(LEVEL_START_XP, total_xp)
+    level, start, needed = len(LEVEL_START_XP), LEVEL_START_XP[-1], XP_TO_NEXT[-1]
+    while start + needed <= total_xp:
+        start += needed
+        needed = int(needed * XP_GROWTH)
+        level += 1
+    return level
+
+
+extend_curve(levels=PRECOMPUTED_LEVELS)
+
 
 class LevelSystem:
     def __init__(self):
         self.level = 1
         self.xp = 0
-        self.xp_to_next_level = 100
-        self.level_up_animation = 0
-        self.level_up_particles = []
+        self.xp_to_next_level = BASE_XP_TO_LEVEL
+
+    @property
+    def total_xp(self):
+        extend_curve(levels=self.level)
+        return LEVEL_START_XP[self.level - 1] + self.xp
+
+    def set_level(self, level, xp=0):
+        extend_curve(levels=level)
+        self.level = level
+        self.xp = xp
+        self.xp_to_next_level = XP_TO_NEXT[level - 1]
 
     def add_xp(self, amount):
-        self.xp += amount
-        while self.xp >= self.xp_to_next_level:
-            self.level_up()
-        return self.xp, self.xp_to_next_level
+        if amount <= 0:
+            raise ValueError(f"xp amount must be positive, got {amount}")
+        level = self.level
+        total_xp = self.total_xp + amount
+        self.set_level(level_for_xp(total_xp))
+        self.xp = total_xp - LEVEL_START_XP[self.level - 1]
+        return self.level - level
 
     def level_up(self):
-        self.level += 1
-        self.xp -= self.xp_to_next_level
-        self.xp_to_next_level = int(self.xp_to_next_level * 1.5)
-        self.level_up_animation = 60
-        for _ in range(30):
-            angle = random.uniform(0, 2 * math.pi)
-            speed = random.uniform(2, 5)
-            self.level_up_particles.append({
-                'pos': [0, 0],
-                'vel': [math.cos(angle) * speed, math.sin(angle) * speed],
-                'lifetime': random.randint(30, 60),
-                'max_lifetime': 60
-            })
+        self.add_xp(self.xp_to_next_level - self.xp)
         return True
-
-    def update(self):
-        if self.level_up_animation > 0:
-            self.level_up_animation -= 1
-            for particle in self.level_up_particles[:]:
-                particle['pos'][0] += particle['vel'][0]
-                particle['pos'][1] += particle['vel'][1]
-                particle['lifetime'] -= 1
-                if particle['lifetime'] <= 0:
-                    self.level_up_particles.remove(particle)
-
-    def draw(self, screen, x, y):
-        bar_width = 200
-        bar_height = 20
-        xp_percent = self.xp / self.xp_to_next_level
-        
-        pygame.draw.rect(screen, (50, 50, 50), (x, y, bar_width, bar_height), border_radius=10)
-        if xp_percent > 0:
-            fill_width = int(bar_width * xp_percent)
-            pygame.draw.rect(screen, YELLOW, (x, y, fill_width, bar_height), border_radius=10)
-        pygame.draw.rect(screen, WHITE, (x, y, bar_width, bar_height), 2, border_radius=10)
-        
-        level_text = f"Level {self.level}"
-        font = pygame.font.Font(None, 24)
-        text_surface = font.render(level_text, True, WHITE)
-        screen.blit(text_surface, (x + bar_width + 10, y))
-        
-        xp_text = f"XP: {self.xp}/{self.xp_to_next_level}"
-        text_surface = font.render(xp_text, True, WHITE)
-        screen.blit(text_surface, (x, y - 25))
-        
-        if self.level_up_animation > 0:
-            for particle in self.level_up_particles:
-                alpha = int((particle['lifetime'] / particle['max_lifetime']) * 255)
-                color = (*YELLOW, alpha)
-                pos = (int(x + bar_width/2 + particle['pos'][0]), 
-                      int(y + bar_height/2 + particle['pos'][1]))
-                pygame.draw.circle(screen, color, pos, 3) 
\ No newline at end of file
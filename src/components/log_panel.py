@@ -0,0 +1,49 @@
+import pygame
+from src.utils.constants import WHITE
+
+class LogPanel:
+    def __init__(self, x, y, width, height, font, visible_lines=5, line_height=30, padding=20):
+        self.position = (x, y)
+        self.font = font
+        self.visible_lines = visible_lines
+        self.line_height = line_height
+        self.padding = padding
+        self.background = pygame.Surface((width, height))
+        self.background.fill((30, 30, 50))
+        self.background.set_alpha(200)
+        self.lines = pygame.Surface((width, height), pygame.SRCALPHA)
+        self.log = None
+        self.shown = 0
+        self.rows = 0
+
+    def attach(self, log):
+        self.log = log
+        self.shown = 0
+        self.rows = 0
+        self.lines.fill((0, 0, 0, 0))
+
+    def update(self):
+        if self.log is None or self.log.total == self.shown:
+            return
+        for entry in self.log.tail(min(self.log.total - self.shown, self.visible_lines)):
+            self.add_line(entry)
+        self.shown = self.log.total
+
+    def add_line(self, text):
+        width = self.lines.get_width()
+        if self.rows == self.visible_lines:
+            self.lines.scroll(0, -self.line_height)
+            self.lines.fill((0, 0, 0, 0), (0, 0, width, self.padding))
+            row = self.rows - 1
+        else:
+            row = self.rows
+            self.rows += 1
+        y = self.padding + row * self.line_height
+        self.lines.fill((0, 0, 0, 0), (0, y, width, self.lines.get_height() - y))
+        self.lines.blit(self.font.render(text, True, (0, 0, 0)), (self.padding + 2, y + 2))
+        self.lines.blit(self.font.render(text, True, WHITE), (self.padding, y))
+
+    def draw(self, screen):
+        self.update()
+        screen.blit(self.background, self.position)
+        screen.blit(self.lines, self.position)
@@ -0,0 +1,183 @@
+import numpy as np
+from src.components.combat_events import EventBus, TURN, VOLLEY
+from src.simulation.monte_carlo import (
+    CRIT_MULTIPLIER, SPECIAL_COOLDOWN, ENEMY_SPECIAL_CHANCE, STEALTH_CRIT_CHANCE
+)
+from src.utils.constants import (
+    BURN_CHANCE, BURN_DAMAGE, BURN_DURATION, BLESS_DEFENSE, BLESS_DURATION, STEALTH_DURATION
+)
+from src.utils.rng import BattleRandom
+
+HEROES = 0
+ENEMIES = 1
+SIDE_NAMES = ("Heroes", "Enemies")
+INITIATIVE_PHASES = 4
+TARGETING = ('random', 'weakest', 'front')
+
+NO_ABILITY = 0
+STRIKE = 1
+FIREBALL = 2
+STEALTH = 3
+HOLY_LIGHT = 4
+ABILITY_CODES = {'none': NO_ABILITY, 'strike': STRIKE, 'fireball': FIREBALL, 'stealth': STEALTH,
+                 'holy_light': HOLY_LIGHT}
+
+
+class PartyBattle:
+    def __init__(self, heroes, enemies, seed=None, targeting=('random', 'random'),
+                 special_chance=(1.0, ENEMY_SPECIAL_CHANCE)):
+        for rule in targeting:
+            if rule not in TARGETING:
+                raise ValueError(f"unknown targeting rule {rule!r}, expected one of {TARGETING}")
+        units = list(heroes) + list(enemies)
+        self.units = units
+        self.targeting = targeting
+        self.random = BattleRandom(seed)
+        self.seed = self.random.seed
+        self.rng = np.random.default_rng(self.random.gameplay.seed_sequence)
+        self.events = EventBus()
+        self.current_turn = 0
+
+        self.side = np.array([HEROES] * len(heroes) + [ENEMIES] * len(enemies))
+        self.max_health = np.array([unit.max_health for unit in units], dtype=float)
+        self.health = np.array([unit.health for unit in units], dtype=float)
+        self.attack = np.array([unit.attack for unit in units], dtype=float)
+        self.defense = np.array([unit.defense for unit in units], dtype=float)
+        self.base_crit_chance = np.array([unit.crit_chance for unit in units], dtype=float)
+        self.crit_chance = self.base_crit_chance.copy()
+        self.dodge_chance = np.array([unit.dodge_chance for unit in units], dtype=float)
+        self.multiplier = np.array([unit.character_class.multiplier for unit in units], dtype=float)
+        self.ability = np.array([ABILITY_CODES[unit.character_class.ability] for unit in units])
+        self.special_chance = np.array(special_chance, dtype=float)[self.side]
+        self.cooldown = np.zeros(len(units))
+        self.burn_left = np.zeros(len(units))
+        self.bless_left = np.zeros(len(units))
+        self.stealth_left = np.zeros(len(units))
+        self.damage_taken = np.zeros(len(units))
+
+        self.members = (np.flatnonzero(self.side == HEROES), np.flatnonzero(self.side == ENEMIES))
+        self.damaging = (self.ability == STRIKE) | (self.ability == FIREBALL)
+
+        self.initiative = self.rng.integers(0, INITIATIVE_PHASES, len(units))
+        self.queue = [phase for phase in (np.flatnonzero(self.initiative == p)
+                                          for p in reversed(range(INITIATIVE_PHASES))) if len(phase)]
+
+    def alive(self):
+        return self.health > 0
+
+    def survivors(self, side):
+        return np.count_nonzero(self.health[self.members[side]] > 0)
+
+    def is_battle_over(self):
+        return self.survivors(HEROES) == 0 or self.survivors(ENEMIES) == 0
+
+    def winner(self):
+        if self.survivors(ENEMIES) == 0:
+            return HEROES
+        if self.survivors(HEROES) == 0:
+            return ENEMIES
+        return None
+
+    def execute_turn(self):
+        self.current_turn += 1
+        self.events.emit(TURN, amount=self.current_turn)
+        before = None
+        if self.events.subscribers:
+            before = (self.damage_taken.copy(), self.health > 0)
+        for phase in self.queue:
+            actors = phase[self.health[phase] > 0]
+            if len(actors) and not self._act(actors):
+                break
+        alive = self.health > 0
+        np.subtract(self.cooldown, alive, out=self.cooldown)
+        np.maximum(self.cooldown, 0, out=self.cooldown)
+        self._tick_effects(alive)
+        if before is not None:
+            self._report(*before)
+
+    def _act(self, actors):
+        targets = self._pick_targets(actors)
+        if targets is None:
+            return False
+        u = self.rng.random((4, len(actors)))
+        special = (self.cooldown[actors] == 0) & (u[0] < self.special_chance[actors])
+        ability = self.ability[actors]
+        damaging = special & self.damaging[actors]
+        hits = ~special | damaging
+        damage = self.attack[actors]
+        if damaging.any():
+            damage = np.where(damaging, damage * self.multiplier[actors], damage)
+        if hits.all():
+            self._hit(targets, damage, u[1], u[2])
+        else:
+            self._hit(targets[hits], damage[hits], u[1][hits], u[2][hits])
+        if not special.any():
+            return True
+
+        self.cooldown[actors[special]] = SPECIAL_COOLDOWN
+        self.burn_left[targets[special & (ability == FIREBALL) & (u[3] < BURN_CHANCE)]] = BURN_DURATION
+        hidden = actors[special & (ability == STEALTH)]
+        self.crit_chance[hidden] = STEALTH_CRIT_CHANCE
+        self.stealth_left[hidden] = STEALTH_DURATION
+        healers = actors[special & (ability == HOLY_LIGHT)]
+        if len(healers):
+            self.health[healers] = np.minimum(
+                self.max_health[healers], self.health[healers] + self.attack[healers] * self.multiplier[healers])
+            self.defense[healers[self.bless_left[healers] == 0]] += BLESS_DEFENSE
+            self.bless_left[healers] = BLESS_DURATION
+        return True
+
+    def _pick_targets(self, actors):
+        targets = np.empty(len(actors), dtype=np.intp)
+        sides = self.side[actors]
+        for side, rule in enumerate(self.targeting):
+            mine = sides == side
+            count = np.count_nonzero(mine)
+            if count == 0:
+                continue
+            foes = self.members[1 - side]
+            foes = foes[self.health[foes] > 0]
+            if len(foes) == 0:
+                return None
+            if rule == 'random':
+                targets[mine] = foes[self.rng.integers(0, len(foes), count)]
+            elif rule == 'weakest':
+                targets[mine] = foes[np.argmin(self.health[foes])]
+            else:
+                targets[mine] = foes[0]
+        return targets
+
+    def _hit(self, targets, damage, u_crit, u_dodge):
+        crit = u_crit < self.crit_chance[targets]
+        if crit.any():
+            damage = np.where(crit, damage * CRIT_MULTIPLIER, damage)
+        dealt = np.maximum(damage - self.defense[targets], 1.0)
+        dealt[u_dodge < self.dodge_chance[targets]] = 0.0
+        taken = np.bincount(targets, weights=dealt, minlength=len(self.health))
+        self.damage_taken += taken
+        self.health -= taken
+        np.maximum(self.health, 0.0, out=self.health)
+
+    def _tick_effects(self, alive):
+        burning = np.flatnonzero(alive & (self.burn_left > 0))
+        if len(burning):
+            u = self.rng.random((2, len(burning)))
+            self._hit(burning, np.full(len(burning), float(BURN_DAMAGE)), u[0], u[1])
+            self.burn_left[burning] -= 1
+        blessed = np.flatnonzero(alive & (self.bless_left > 0))
+        if len(blessed):
+            self.bless_left[blessed] -= 1
+            self.defense[blessed[self.bless_left[blessed] == 0]] -= BLESS_DEFENSE
+        hidden = np.flatnonzero(alive & (self.stealth_left > 0))
+        if len(hidden):
+            self.stealth_left[hidden] -= 1
+            expired = hidden[self.stealth_left[hidden] == 0]
+            self.crit_chance[expired] = self.base_crit_chance[expired]
+
+    def _report(self, damage_taken, alive):
+        lost = self.damage_taken - damage_taken
+        fallen = alive & (self.health <= 0)
+        for side, name in enumerate(SIDE_NAMES):
+            foes = self.members[1 - side]
+            self.events.emit(VOLLEY, name, amount=round(float(lost[foes].sum()), 1),
+                             variant=int(np.count_nonzero(fallen[foes])))
@@ -0,0 +1,51 @@
+import math
+
+import pygame
+from src.components.character_sprite import CharacterSprite
+from src.components.party_battle import HEROES
+
+class PartyView:
+    def __init__(self, battle, area_width, area_height, top=120, margin=50):
+        self.battle = battle
+        self.sprites = {}
+        self.surfaces = []
+        self.positions = []
+        self.bars = []
+        for side, members in enumerate(battle.members):
+            left = margin if side == HEROES else margin + area_width + 2 * margin
+            self.layout(members, left, top, area_width, area_height)
+
+    def layout(self, members, left, top, width, height):
+        if len(members) == 0:
+            return
+        columns = math.ceil(math.sqrt(len(members) * width / height))
+        rows = math.ceil(len(members) / columns)
+        scale = min(width / columns / 100, height / rows / 150, 1.0)
+        size = (max(1, int(100 * scale)), max(1, int(150 * scale)))
+        for i, unit in enumerate(self.battle.units[index] for index in members):
+            x = left + (i % columns) * width // columns
+            y = top + (i // columns) * height // rows
+            self.surfaces.append(self.sprite_for(unit, size))
+            self.positions.append((x, y))
+            self.bars.append(pygame.Rect(x, y + size[1], size[0], max(2, size[1] // 25)))
+
+    def sprite_for(self, unit, size):
+        key = (unit.name, size)
+        if key not in self.sprites:
+            sprite = CharacterSprite(unit.name, unit.character_class.playable).sprite
+            self.sprites[key] = pygame.transform.smoothscale(sprite, size)
+        return self.sprites[key]
+
+    def draw(self, screen):
+        health = self.battle.health
+        max_health = self.battle.max_health
+        alive = (health > 0).tolist()
+        screen.blits([(self.surfaces[i], self.positions[i]) for i in range(len(alive)) if alive[i]],
+                     doreturn=False)
+        fractions = (health / max_health).tolist()
+        for i, bar in enumerate(self.bars):
+            if alive[i]:
+                screen.fill((50, 50, 50), bar)
+                fraction = fractions[i]
+                screen.fill((int(255 * (1 - fraction)), int(255 * fraction), 0),
+                            (bar.x, bar.y, int(bar.width * fraction), bar.height))
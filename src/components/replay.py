@@ -0,0 +1,273 @@
+import argparse
+import mmap
+import os
+import struct
+import time
+
+from src.components.battle_system import BattleSystem, ScriptedPolicy
+from src.components.character import Character
+from src.components.class_registry import CHARACTER_STATS, EFFECTS, PLAYER_CLASSES
+
+MAGIC = b"RPGR"
+VERSION = 2
+KEYFRAME_INTERVAL = 16
+MAX_EFFECTS = 4
+ACTIONS = ('attack', 'special')
+EFFECT_NAMES = tuple(EFFECTS)
+
+FILE_HEADER = struct.Struct("<4sBB")
+RECORD = struct.Struct("<QBBBBBBffHHHff")
+KEYFRAME = struct.Struct("<HHI" + "dB" * 2 + "BHH" * MAX_EFFECTS)
+INDEX = struct.Struct("<Q")
+TRAILER = struct.Struct("<QQI4s")
+FLOAT = struct.Struct("<f")
+
+
+def as_float32(value):
+    return FLOAT.unpack(FLOAT.pack(value))[0]
+
+
+def pack_inputs(inputs):
+    packed = bytearray((len(inputs) + 7) // 8)
+    for i, action in enumerate(inputs):
+        if action == 'special':
+            packed[i >> 3] |= 1 << (i & 7)
+    return bytes(packed)
+
+
+def unpack_inputs(packed, count):
+    return [ACTIONS[packed[i >> 3] >> (i & 7) & 1] for i in range(count)]
+
+
+def build_battle(lineup, seed, inputs, xp_reward, log=True):
+    characters = []
+    for name, growth_levels, level, health in lineup:
+        character = Character(name, CHARACTER_STATS[name])
+        character.level_up_stats(growth_levels)
+        character.level_system.set_level(level)
+        character.health = health
+        characters.append(character)
+    return BattleSystem(characters[0], characters[1], xp_reward, ScriptedPolicy(inputs), seed, log)
+
+
+def step(battle):
+    action = next(battle.enemy_policy.actions, None)
+    if action is None or battle.is_battle_over():
+        return False
+    battle.execute_turn(action)
+    return True
+
+
+def snapshot(battle):
+    sides = (battle.player, battle.enemy)
+    values = [battle.current_turn, battle.effects.turn, battle.random.gameplay.tell()]
+    for character in sides:
+        values += [character.health, character.special_cooldown]
+    effects = battle.effects.pending()
+    if len(effects) > MAX_EFFECTS:
+        raise ValueError(f"cannot store more than {MAX_EFFECTS} active effects in a keyframe")
+    for effect in effects:
+        side = 0 if effect.target is battle.player else 1
+        values += [side << 4 | EFFECT_NAMES.index(effect.name) + 1, effect.expires_at, effect.due]
+    values += [0, 0, 0] * (MAX_EFFECTS - len(effects))
+    return KEYFRAME.pack(*values)
+
+
+def restore(battle, keyframe):
+    values = KEYFRAME.unpack(keyframe)
+    sides = (battle.player, battle.enemy)
+    battle.current_turn, battle.effects.turn, position = values[:3]
+    battle.random.gameplay.seek(position)
+    for i, character in enumerate(sides):
+        character.health, character.special_cooldown = values[3 + 2 * i:5 + 2 * i]
+    for slot in range(MAX_EFFECTS):
+        code, expires_at, due = values[7 + 3 * slot:10 + 3 * slot]
+        if code:
+            effect = EFFECTS[EFFECT_NAMES[(code & 15) - 1]]()
+            effect.restore(sides[code >> 4], battle.effects, expires_at, due)
+
+
+class ReplayWriter:
+    def __init__(self, path, keyframe_interval=KEYFRAME_INTERVAL):
+        self.file = open(path, "wb")
+        self.keyframe_interval = keyframe_interval
+        self.classes = []
+        self.offsets = []
+        self.file.write(FILE_HEADER.pack(MAGIC, VERSION, keyframe_interval))
+
+    def class_id(self, name):
+        if name not in self.classes:
+            self.classes.append(name)
+        return self.classes.index(name)
+
+    def add(self, battle):
+        replay = build_battle(battle.lineup, battle.seed, battle.inputs, battle.xp_reward, log=False)
+        keyframes = []
+        while step(replay):
+            if replay.current_turn % self.keyframe_interval == 0 and not replay.is_battle_over():
+                keyframes.append(snapshot(replay))
+        outcome = (replay.player.health, replay.enemy.health)
+        if outcome != (battle.player.health, battle.enemy.health):
+            raise ValueError(f"battle with seed {battle.seed} does not replay from its inputs")
+
+        (player, player_growth, player_level, player_health), (enemy, enemy_growth, enemy_level, enemy_health) = battle.lineup
+        self.offsets.append(self.file.tell())
+        self.file.write(RECORD.pack(
+            battle.seed, self.class_id(player), self.class_id(enemy),
+            player_growth, player_level, enemy_growth, enemy_level, player_health, enemy_health,
+            battle.xp_reward, len(battle.inputs), len(keyframes), *outcome
+        ))
+        self.file.write(pack_inputs(battle.inputs))
+        self.file.write(b"".join(keyframes))
+
+    def close(self):
+        if self.file.closed:
+            return
+        classes_at = self.file.tell()
+        self.file.write(bytes([len(self.classes)]))
+        for name in self.classes:
+            encoded = name.encode("utf-8")
+            self.file.write(bytes([len(encoded)]) + encoded)
+        index_at = self.file.tell()
+        self.file.write(b"".join(INDEX.pack(offset) for offset in self.offsets))
+        self.file.write(TRAILER.pack(classes_at, index_at, len(self.offsets), MAGIC))
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class ReplayArchive:
+    def __init__(self, path):
+        self.file = open(path, "rb")
+        self.data = mmap.mmap(self.file.fileno(), 0, access=mmap.ACCESS_READ)
+        magic, version, self.keyframe_interval = FILE_HEADER.unpack_from(self.data, 0)
+        classes_at, self.index_at, self.count, trailer = TRAILER.unpack_from(self.data, len(self.data) - TRAILER.size)
+        if magic != MAGIC or trailer != MAGIC or version != VERSION:
+            self.close()
+            raise ValueError(f"{path} is not a version {VERSION} replay archive")
+        self.classes = []
+        position = classes_at + 1
+        for _ in range(self.data[classes_at]):
+            length = self.data[position]
+            self.classes.append(self.data[position + 1:position + 1 + length].decode("utf-8"))
+            position += 1 + length
+
+    def __len__(self):
+        return self.count
+
+    def __getitem__(self, index):
+        if not 0 <= index < self.count:
+            raise IndexError(index)
+        return BattleReplay(self, INDEX.unpack_from(self.data, self.index_at + index * INDEX.size)[0])
+
+    def __iter__(self):
+        return (self[i] for i in range(self.count))
+
+    def close(self):
+        self.data.close()
+        self.file.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+
+class BattleReplay:
+    def __init__(self, archive, offset):
+        (self.seed, player, enemy, player_growth, player_level, enemy_growth, enemy_level,
+         player_health, enemy_health, self.xp_reward, self.input_count, self.keyframe_count,
+         player_final, enemy_final) = RECORD.unpack_from(archive.data, offset)
+        self.lineup = (
+            (archive.classes[player], player_growth, player_level, player_health),
+            (archive.classes[enemy], enemy_growth, enemy_level, enemy_health)
+        )
+        self.outcome = (player_final, enemy_final)
+        self.data = archive.data
+        self.keyframe_interval = archive.keyframe_interval
+        self.inputs_at = offset + RECORD.size
+        self.keyframes_at = self.inputs_at + (self.input_count + 7) // 8
+        self.turns = (self.input_count + 1) // 2
+
+    def inputs(self):
+        return unpack_inputs(self.data[self.inputs_at:self.keyframes_at], self.input_count)
+
+    def keyframe(self, index):
+        start = self.keyframes_at + index * KEYFRAME.size
+        return self.data[start:start + KEYFRAME.size]
+
+    def seek(self, turn=0, log=True):
+        turn = max(0, min(turn, self.turns))
+        keyframe = min(turn // self.keyframe_interval, self.keyframe_count)
+        start = keyframe * self.keyframe_interval
+        battle = build_battle(self.lineup, self.seed, self.inputs()[2 * start:], self.xp_reward, log)
+        if keyframe:
+            restore(battle, self.keyframe(keyframe - 1))
+        while battle.current_turn < turn and step(battle):
+            pass
+        return battle
+
+    def verify(self):
+        battle = self.seek(0, log=False)
+        keyframe = 0
+        while step(battle):
+            if battle.current_turn % self.keyframe_interval == 0 and not battle.is_battle_over():
+                if keyframe >= self.keyframe_count or snapshot(battle) != self.keyframe(keyframe):
+                    return False
+                keyframe += 1
+        outcome = (as_float32(battle.player.health), as_float32(battle.enemy.health))
+        return keyframe == self.keyframe_count and outcome == self.outcome
+
+
+def record(path, battles, heroes, enemy, seed, keyframe_interval):
+    log_bytes = 0
+    with ReplayWriter(path, keyframe_interval) as writer:
+        for i in range(battles):
+            hero = heroes[i % len(heroes)]
+            battle = BattleSystem(Character(hero, CHARACTER_STATS[hero]),
+                                  Character(enemy, CHARACTER_STATS[enemy]), seed=seed + i)
+            while not battle.is_battle_over():
+                battle.execute_turn('special' if battle.player.special_cooldown == 0 else 'attack')
+            log_bytes += len("\n".join(battle.combat_log).encode("utf-8")) + 1
+            writer.add(battle)
+    return log_bytes
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Record and verify binary battle replays")
+    subparsers = parser.add_subparsers(dest="command", required=True)
+    record_parser = subparsers.add_parser("record", help="record seeded battles into an archive")
+    record_parser.add_argument("path")
+    record_parser.add_argument("--battles", type=int, default=1000)
+    record_parser.add_argument("--heroes", nargs="+", default=PLAYER_CLASSES)
+    record_parser.add_argument("--enemy", default="Enemy")
+    record_parser.add_argument("--seed", type=int, default=0)
+    record_parser.add_argument("--keyframe-interval", type=int, default=KEYFRAME_INTERVAL)
+    verify_parser = subparsers.add_parser("verify", help="replay every battle headless and check it")
+    verify_parser.add_argument("path")
+    args = parser.parse_args()
+
+    start = time.perf_counter()
+    if args.command == "record":
+        log_bytes = record(args.path, args.battles, args.heroes, args.enemy, args.seed, args.keyframe_interval)
+        size = os.path.getsize(args.path)
+        print(f"Recorded {args.battles} battles in {time.perf_counter() - start:.2f}s: "
+              f"{size} bytes vs {log_bytes} bytes of combat log ({log_bytes / size:.1f}x smaller)")
+        return
+
+    with ReplayArchive(args.path) as archive:
+        failed = [i for i, replay in enumerate(archive) if not replay.verify()]
+        elapsed = time.perf_counter() - start
+        print(f"Verified {len(archive)} battles in {elapsed:.2f}s "
+              f"({len(archive) / elapsed:.0f} battles/s), {len(failed)} mismatched")
+        if failed:
+            print("Mismatched battles:", " ".join(str(i) for i in failed[:20]))
+
+
+if __name__ == "__main__":
+    main()
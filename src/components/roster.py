@@ -0,0 +1,145 @@
+import numpy as np
+from src.components.character import BASE_STATS, Character
+from src.components.class_registry import CHARACTER_STATS, get_class
+from src.components.level_system import LEVEL_START_XP, PRECOMPUTED_LEVELS, extend_curve
+
+XP_LIMIT = np.iinfo(np.int64).max
+STATS = ('health', 'attack', 'defense', 'crit_chance')
+COLUMNS = (
+    ('class_id', np.uint8),
+    ('level', np.uint16),
+    ('xp', np.int64),
+    ('health', np.float32),
+    ('max_health', np.float32),
+    ('attack', np.float32),
+    ('defense', np.float32),
+    ('crit_chance', np.float64)
+)
+
+extend_curve(levels=PRECOMPUTED_LEVELS)
+LEVEL_STARTS = np.array([xp for xp in LEVEL_START_XP if xp < XP_LIMIT], dtype=np.int64)
+MAX_LEVEL = len(LEVEL_STARTS)
+
+
+def sort_order(values, descending=False):
+    if not descending:
+        return np.argsort(values, kind='stable')
+    order = np.argsort(values[::-1], kind='stable')
+    return (len(values) - 1 - order)[::-1]
+
+
+class Roster:
+    def __init__(self, capacity=1024, classes=None):
+        self.classes = list(classes or CHARACTER_STATS)
+        self.class_ids = {name: i for i, name in enumerate(self.classes)}
+        self.base = np.zeros((len(self.classes), len(STATS)))
+        self.growth = np.zeros((len(self.classes), len(STATS)))
+        for i, name in enumerate(self.classes):
+            base = dict(BASE_STATS, **CHARACTER_STATS[name])
+            growth = get_class(name, CHARACTER_STATS[name]).growth
+            self.base[i] = [base[stat] for stat in STATS]
+            self.growth[i] = [growth.get(stat, 0) for stat in STATS]
+        self.size = 0
+        self.data = {name: np.zeros(capacity, dtype=dtype) for name, dtype in COLUMNS}
+
+    def __len__(self):
+        return self.size
+
+    def __getitem__(self, column):
+        return self.data[column][:self.size]
+
+    @property
+    def nbytes(self):
+        return sum(column.nbytes for column in self.data.values())
+
+    def reserve(self, capacity):
+        if capacity <= len(self.data['level']):
+            return
+        capacity = max(capacity, 2 * len(self.data['level']))
+        for name, column in self.data.items():
+            grown = np.zeros(capacity, dtype=column.dtype)
+            grown[:self.size] = column[:self.size]
+            self.data[name] = grown
+
+    def add(self, class_name, count=1, level=1):
+        if not 1 <= level <= MAX_LEVEL:
+            raise ValueError(f"level must be between 1 and {MAX_LEVEL}")
+        self.reserve(self.size + count)
+        index = np.arange(self.size, self.size + count)
+        self.size += count
+        self['class_id'][index] = self.class_ids[class_name]
+        self['level'][index] = level
+        self['xp'][index] = 0
+        self._refresh_stats(index)
+        self['health'][index] = self['max_health'][index]
+        return index
+
+    def _refresh_stats(self, index):
+        class_id = self['class_id'][index]
+        gained = (self['level'][index].astype(np.float64) - 1)[:, None]
+        stats = self.base[class_id] + self.growth[class_id] * gained
+        self['max_health'][index] = stats[:, 0]
+        self['attack'][index] = stats[:, 1]
+        self['defense'][index] = stats[:, 2]
+        self['crit_chance'][index] = stats[:, 3]
+
+    def grant_xp(self, amount, index=None):
+        if np.any(np.asarray(amount) <= 0):
+            raise ValueError("xp amounts must be positive")
+        if index is None:
+            index = np.arange(self.size)
+        level = self['level'][index]
+        start = LEVEL_STARTS[level - 1] + self['xp'][index]
+        total = start + np.minimum(amount, XP_LIMIT - start)
+        new_level = np.searchsorted(LEVEL_STARTS, total, side='right')
+        gained = new_level - level
+        self['level'][index] = new_level
+        self['xp'][index] = total - LEVEL_STARTS[new_level - 1]
+        leveled = index[gained > 0]
+        if len(leveled):
+            self._refresh_stats(leveled)
+            self['health'][leveled] = self['max_health'][leveled]
+        return gained
+
+    def filter(self, class_name=None, min_level=None, max_level=None, alive=None):
+        mask = np.ones(self.size, dtype=bool)
+        if class_name is not None:
+            mask &= self['class_id'] == self.class_ids[class_name]
+        if min_level is not None:
+            mask &= self['level'] >= min_level
+        if max_level is not None:
+            mask &= self['level'] <= max_level
+        if alive is not None:
+            mask &= (self['health'] > 0) == alive
+        return np.flatnonzero(mask)
+
+    def sort(self, column, index=None, descending=False):
+        if index is None:
+            index = np.arange(self.size)
+        return index[sort_order(self[column][index], descending)]
+
+    def top(self, column, count, index=None):
+        if index is None:
+            index = np.arange(self.size)
+        values = self[column][index]
+        if count < len(index):
+            best = np.argpartition(values, len(index) - count)[len(index) - count:]
+            best.sort()
+            index, values = index[best], values[best]
+        return index[sort_order(values, descending=True)]
+
+    def materialize(self, hero):
+        name = self.classes[self['class_id'][hero]]
+        level = int(self['level'][hero])
+        character = Character(name, CHARACTER_STATS[name])
+        character.level_up_stats(level - 1)
+        character.level_system.set_level(level, int(self['xp'][hero]))
+        character.health = float(self['health'][hero])
+        return character
+
+    def store(self, hero, character):
+        level_system = character.level_system
+        self['level'][hero] = min(level_system.level, MAX_LEVEL)
+        self['xp'][hero] = min(level_system.xp, XP_LIMIT)
+        self._refresh_stats(np.array([hero]))
+        self['health'][hero] = character.health
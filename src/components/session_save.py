@@ -0,0 +1,286 @@
+import os
+import queue
+import struct
+import threading
+from collections import deque
+
+from src.components.battle_system import BattleSystem
+from src.components.character import BASE_STATS, Character
+from src.components.class_registry import EFFECTS
+from src.components.combat_events import NOTE
+from src.utils.constants import LOG_CAPACITY
+
+MAGIC = b"RPGS"
+VERSION = 2
+COMPACT_BYTES = 1 << 20
+EFFECT_NAMES = tuple(EFFECTS)
+STATS = tuple(BASE_STATS)
+
+GAME = 1
+PLAYER = 2
+ENEMY = 3
+EFFECTS_SECTION = 4
+RANDOM = 5
+LOG = 6
+COMMIT = 15
+
+NO_HERO = -1
+
+FILE_HEADER = struct.Struct("<4sB")
+SECTION_HEADER = struct.Struct("<BI")
+GAME_STATE = struct.Struct("<qIIQB")
+CHARACTER_STATE = struct.Struct("<q5dIIQdBB")
+EFFECT_COUNT = struct.Struct("<IB")
+EFFECT_STATE = struct.Struct("<BBII")
+RANDOM_STATE = struct.Struct("<QQQ")
+LOG_HEADER = struct.Struct("<BI")
+LINE_LENGTH = struct.Struct("<H")
+SEQUENCE = struct.Struct("<I")
+
+
+def pack_name(name):
+    encoded = name.encode("utf-8")
+    return bytes([len(encoded)]) + encoded
+
+
+def pack_character(character):
+    hero_id = NO_HERO if character.hero_id is None else character.hero_id
+    values = [character.base_stats[stat] for stat in STATS] + [character.health]
+    integral = sum(1 << i for i, value in enumerate(values) if isinstance(value, int))
+    return pack_name(character.name) + CHARACTER_STATE.pack(
+        hero_id, *values[:-1], character.growth_levels, character.level_system.level,
+        character.level_system.xp, values[-1], character.special_cooldown, integral
+    )
+
+
+def typed(values, integral):
+    return [int(value) if integral >> i & 1 else value for i, value in enumerate(values)]
+
+
+def unpack_character(payload):
+    length = payload[0]
+    name = payload[1:1 + length].decode("utf-8")
+    values = CHARACTER_STATE.unpack_from(payload, 1 + length)
+    stats = typed(values[1:6] + values[9:10], values[11])
+    return {
+        'name': name,
+        'hero_id': None if values[0] == NO_HERO else values[0],
+        'base_stats': dict(zip(STATS, stats)),
+        'growth_levels': values[6],
+        'level': values[7],
+        'xp': values[8],
+        'health': stats[5],
+        'special_cooldown': values[10]
+    }
+
+
+def pack_effects(battle):
+    effects = battle.effects.pending()
+    payload = [EFFECT_COUNT.pack(battle.effects.turn, len(effects))]
+    for effect in effects:
+        side = 0 if effect.target is battle.player else 1
+        payload.append(EFFECT_STATE.pack(side, EFFECT_NAMES.index(effect.name), effect.expires_at, effect.due))
+    return b"".join(payload)
+
+
+def pack_log(lines, replace):
+    payload = [LOG_HEADER.pack(replace, len(lines))]
+    for line in lines:
+        encoded = line.encode("utf-8")
+        payload.append(LINE_LENGTH.pack(len(encoded)) + encoded)
+    return b"".join(payload)
+
+
+def unpack_log(payload):
+    replace, count = LOG_HEADER.unpack_from(payload, 0)
+    position = LOG_HEADER.size
+    lines = []
+    for _ in range(count):
+        length = LINE_LENGTH.unpack_from(payload, position)[0]
+        position += LINE_LENGTH.size
+        lines.append(payload[position:position + length].decode("utf-8"))
+        position += length
+    return replace, lines
+
+
+def capture(game):
+    battle = game.battle
+    random = battle.random
+    return {
+        GAME: GAME_STATE.pack(battle.seed, battle.current_turn, game.enemy_level, game.enemy_xp_reward,
+                              game.endless),
+        PLAYER: pack_character(battle.player),
+        ENEMY: pack_character(battle.enemy),
+        EFFECTS_SECTION: pack_effects(battle),
+        RANDOM: RANDOM_STATE.pack(random.gameplay.tell(), random.decisions.tell(), random.cosmetic.tell())
+    }
+
+
+def record(section, payload):
+    return SECTION_HEADER.pack(section, len(payload)) + payload
+
+
+def read_session(path):
+    with open(path, "rb") as f:
+        data = f.read()
+    magic, version = FILE_HEADER.unpack_from(data, 0)
+    if magic != MAGIC or version != VERSION:
+        raise ValueError(f"{path} is not a version {VERSION} session save")
+    sections = {}
+    log = deque(maxlen=LOG_CAPACITY)
+    pending = {}
+    pending_log = []
+    position = FILE_HEADER.size
+    while position + SECTION_HEADER.size <= len(data):
+        section, length = SECTION_HEADER.unpack_from(data, position)
+        position += SECTION_HEADER.size
+        if position + length > len(data):
+            break
+        payload = data[position:position + length]
+        position += length
+        if section == LOG:
+            pending_log.append(unpack_log(payload))
+        elif section == COMMIT:
+            sections.update(pending)
+            for replace, lines in pending_log:
+                if replace:
+                    log.clear()
+                log.extend(lines)
+            pending = {}
+            pending_log = []
+        else:
+            pending[section] = payload
+    if GAME not in sections:
+        return None
+    return sections, list(log)
+
+
+def restore_character(state, character=None):
+    if character is None:
+        character = Character(state['name'], state['base_stats'])
+    else:
+        character.reset(state['base_stats'])
+    character.hero_id = state['hero_id']
+    character.level_up_stats(state['growth_levels'])
+    character.level_system.set_level(state['level'], state['xp'])
+    character.health = state['health']
+    character.special_cooldown = state['special_cooldown']
+    return character
+
+
+def restore_battle(sections, lines, enemy_policy=None, enemy=None):
+    seed, current_turn, enemy_level, enemy_xp_reward, endless = GAME_STATE.unpack(sections[GAME])
+    states = (unpack_character(sections[PLAYER]), unpack_character(sections[ENEMY]))
+    player = restore_character(states[0])
+    enemy = restore_character(states[1], enemy)
+    battle = BattleSystem(player, enemy, enemy_xp_reward, enemy_policy, seed)
+    battle.current_turn = current_turn
+    for stream, position in zip((battle.random.gameplay, battle.random.decisions, battle.random.cosmetic),
+                                RANDOM_STATE.unpack(sections[RANDOM])):
+        stream.seek(position)
+    payload = sections[EFFECTS_SECTION]
+    battle.effects.turn, count = EFFECT_COUNT.unpack_from(payload, 0)
+    for i in range(count):
+        side, name, expires_at, due = EFFECT_STATE.unpack_from(payload, EFFECT_COUNT.size + i * EFFECT_STATE.size)
+        EFFECTS[EFFECT_NAMES[name]]().restore((player, enemy)[side], battle.effects, expires_at, due)
+    for line in lines:
+        battle.events.emit(NOTE, variant=line)
+    return battle, enemy_level, bool(endless)
+
+
+class SessionSaver:
+    def __init__(self, path, compact_bytes=COMPACT_BYTES):
+        self.path = path
+        self.compact_bytes = compact_bytes
+        self.last = {}
+        self.log = None
+        self.log_total = 0
+        self.sections = {}
+        self.lines = deque(maxlen=LOG_CAPACITY)
+        self.file = None
+        self.sequence = 0
+        self.jobs = queue.Queue()
+        self.thread = threading.Thread(target=self._write_loop, daemon=True)
+        self.thread.start()
+
+    def save(self, game):
+        sections = capture(game)
+        changed = {section: payload for section, payload in sections.items() if self.last.get(section) != payload}
+        self.last.update(changed)
+        log = game.battle.combat_log
+        replace = log is not self.log or (log is not None and log.total < self.log_total)
+        if replace:
+            self.log = log
+            self.log_total = 0
+        lines = []
+        if log is not None:
+            lines = log.tail(min(log.total - self.log_total, LOG_CAPACITY))
+            self.log_total = log.total
+        self.jobs.put(('save', changed, lines, replace))
+
+    def clear(self):
+        self.last = {}
+        self.log = None
+        self.log_total = 0
+        self.jobs.put(('clear',))
+
+    def flush(self):
+        self.jobs.join()
+
+    def close(self):
+        if self.thread is None:
+            return
+        self.jobs.put(None)
+        self.thread.join()
+        self.thread = None
+
+    def _write_loop(self):
+        while True:
+            job = self.jobs.get()
+            try:
+                if job is None:
+                    if self.file is not None:
+                        self.file.close()
+                    return
+                if job[0] == 'clear':
+                    self._clear()
+                else:
+                    self._write(*job[1:])
+            finally:
+                self.jobs.task_done()
+
+    def _write(self, changed, lines, replace):
+        self.sections.update(changed)
+        if replace:
+            self.lines.clear()
+        self.lines.extend(lines)
+        if self.file is None or self.file.tell() > self.compact_bytes:
+            self._rewrite()
+            return
+        self.sequence += 1
+        self.file.write(b"".join(record(section, payload) for section, payload in changed.items())
+                        + (record(LOG, pack_log(lines, replace)) if lines or replace else b"")
+                        + record(COMMIT, SEQUENCE.pack(self.sequence)))
+        self.file.flush()
+
+    def _rewrite(self):
+        if self.file is not None:
+            self.file.close()
+        self.sequence += 1
+        temporary = self.path + ".tmp"
+        with open(temporary, "wb") as f:
+            f.write(FILE_HEADER.pack(MAGIC, VERSION))
+            f.write(b"".join(record(section, payload) for section, payload in sorted(self.sections.items())))
+            f.write(record(LOG, pack_log(list(self.lines), True)))
+            f.write(record(COMMIT, SEQUENCE.pack(self.sequence)))
+        os.replace(temporary, self.path)
+        self.file = open(self.path, "ab")
+
+    def _clear(self):
+        if self.file is not None:
+            self.file.close()
+            self.file = None
+        self.sections = {}
+        self.lines.clear()
+        if os.path.exists(self.path):
+            os.remove(self.path)
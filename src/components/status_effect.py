@@ -1,36 +1,83 @@
-import random
-import pygame
-
 class StatusEffect:
-    def __init__(self, name, duration, color, effect_func):
+    def __init__(self, name, duration, color, effect_func=None, modifiers=None,
+                 stacking='refresh', max_stacks=1, override=False):
         self.name = name
         self.duration = duration
         self.color = color
         self.effect_func = effect_func
+        self.modifiers = modifiers or {}
+        self.override = override
+        self.stacking = stacking
+        self.max_stacks = max_stacks
         self.particles = []
+        self.target = None
+        self.scheduler = None
+        self.expires_at = 0
+        self.due = None
 
     def apply(self, target):
         return self.effect_func(target)
 
+    def attach(self, target, scheduler):
+        self._bind(target, scheduler)
+        self.expires_at = scheduler.turn + self.duration
+        scheduler.schedule(self, 1 if self.effect_func is not None else self.duration)
+
+    def restore(self, target, scheduler, expires_at, due):
+        target.effects.append(self)
+        self._bind(target, scheduler)
+        self.expires_at = expires_at
+        scheduler.schedule(self, due - scheduler.turn)
+
+    def _bind(self, target, scheduler):
+        self.target = target
+        self.scheduler = scheduler
+        if self.modifiers:
+            target.add_modifier(self, self.modifiers, self.override)
+
+    def refresh(self, duration):
+        self.expires_at = self.scheduler.turn + duration
+        if self.effect_func is None:
+            self.scheduler.schedule(self, duration)
+
+    def extend(self, duration):
+        self.expires_at += duration
+        if self.effect_func is None:
+            self.scheduler.schedule(self, self.expires_at - self.scheduler.turn)
+
+    def remaining(self):
+        if self.scheduler is None:
+            return self.duration
+        return max(0, self.expires_at - self.scheduler.turn)
+
+    def tick(self):
+        if self.effect_func is None or self.target is None:
+            return None
+        return self.apply(self.target)
+
+    def settle(self, scheduler):
+        if scheduler.turn >= self.expires_at:
+            self.expire()
+        else:
+            scheduler.schedule(self, 1)
+
+    def expire(self):
+        self.due = None
+        if self.target is None or self not in self.target.effects:
+            return
+        self.target.remove_modifier(self)
+        self.target.effects.remove(self)
+
     def update(self):
-        self.duration -= 1
         for particle in self.particles[:]:
             particle['lifetime'] -= 1
             if particle['lifetime'] <= 0:
                 self.particles.remove(particle)
 
-    def draw_particles(self, screen, pos):
-        for particle in self.particles:
-            alpha = int((particle['lifetime'] / particle['max_lifetime']) * 255)
-            color = (*self.color, alpha)
-            pygame.draw.circle(screen, color, 
-                             (int(pos[0] + particle['offset'][0]), 
-                              int(pos[1] + particle['offset'][1])), 
-                             2)
-
     def add_particle(self, pos):
+        rng = self.target.cosmetic
         self.particles.append({
-            'offset': [random.uniform(-10, 10), random.uniform(-10, 10)],
-            'lifetime': random.randint(20, 40),
+            'offset': [rng.uniform(-10, 10), rng.uniform(-10, 10)],
+            'lifetime': rng.randint(20, 40),
             'max_lifetime': 40
-        }) 
\ No newline at end of file
+        })
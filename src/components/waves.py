@@ -0,0 +1,52 @@
+from src.components.character import Character
+from src.components.class_registry import CHARACTER_STATS
+from src.utils.constants import BASE_XP_REWARD, WAVE_GROWTH, WAVE_XP_GROWTH
+
+WAVE_ENEMY = "Enemy"
+PRECOMPUTED_WAVES = 100
+
+WAVE_STATS = []
+WAVE_XP_REWARDS = []
+
+
+def extend_waves(level):
+    base = CHARACTER_STATS[WAVE_ENEMY]
+    while len(WAVE_STATS) < level:
+        gained = len(WAVE_STATS)
+        stats = dict(base)
+        for stat, growth in WAVE_GROWTH.items():
+            stats[stat] = int(base[stat] * growth ** gained)
+        WAVE_STATS.append(stats)
+        WAVE_XP_REWARDS.append(int(BASE_XP_REWARD * WAVE_XP_GROWTH ** gained))
+
+
+def wave_stats(level):
+    extend_waves(level)
+    return WAVE_STATS[level - 1]
+
+
+def wave_xp_reward(level):
+    extend_waves(level)
+    return WAVE_XP_REWARDS[level - 1]
+
+
+extend_waves(PRECOMPUTED_WAVES)
+
+
+class EnemyPool:
+    def __init__(self, size=1, class_name=WAVE_ENEMY):
+        self.class_name = class_name
+        self.free = [Character(class_name, CHARACTER_STATS[class_name]) for _ in range(size)]
+        self.created = size
+
+    def acquire(self, level=1):
+        if self.free:
+            enemy = self.free.pop()
+        else:
+            enemy = Character(self.class_name, CHARACTER_STATS[self.class_name])
+            self.created += 1
+        enemy.reset(wave_stats(level), level)
+        return enemy
+
+    def release(self, enemy):
+        self.free.append(enemy)
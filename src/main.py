@@ -1,16 +1,43 @@
+import argparse
+import multiprocessing
+import os
 import pygame
 import sys
-import random
+import time
+from src.ai.expectimax import ExpectimaxEnemy
+from src.ai.mcts import MCTSEnemy
 from src.components.button import Button
 from src.components.character import Character
+from src.components.class_registry import CHARACTER_STATS, PLAYER_CLASSES
+from src.components.character_view import CharacterView
+from src.components.hero_store import HeroStore
+from src.components.log_panel import LogPanel
+from src.components.party_battle import HEROES, SIDE_NAMES, PartyBattle
+from src.components.party_view import PartyView
+from src.components.battle_state import History
+from src.components.battle_system import BattleSystem
+from src.components.combat_events import ATTACK, SPECIAL, CombatLog
+from src.components.replay import ReplayArchive, step
+from src.components.session_save import SessionSaver, read_session, restore_battle
+from src.components.waves import EnemyPool, wave_xp_reward
+from src.simulation.advisor import ActionAdvisor
 from src.utils.constants import (
     WINDOW_WIDTH, WINDOW_HEIGHT, WHITE, BLACK, RED, GREEN, BLUE, GOLD,
     DARK_BLUE, LIGHT_BLUE, PURPLE, DARK_PURPLE, SILVER, DARK_GREEN,
-    YELLOW, CHARACTER_STATS
+    YELLOW
 )
 
+REPLAY_TURN_FRAMES = 60
+REPLAY_SPEEDS = (1, 2, 4, 8, 16, 32, 64)
+AUTO_FRAME_SECONDS = 1 / 30
+AUTO_POLICIES = {
+    'attack': lambda player: 'attack',
+    'special': lambda player: 'special',
+    'greedy': lambda player: 'special' if player.special_cooldown == 0 else 'attack'
+}
+
 class Game:
-    def __init__(self):
+    def __init__(self, enemy_policy=None, seed=None, endless=False, store=None, saver=None, advisor=None):
         self.screen = pygame.display.set_mode((WINDOW_WIDTH, WINDOW_HEIGHT))
         pygame.display.set_caption("Epic RPG Battle")
         self.clock = pygame.time.Clock()
@@ -18,6 +45,7 @@ class Game:
         self.font = pygame.font.Font(None, 36)
         self.small_font = pygame.font.Font(None, 24)
         self.background = self.create_background()
+        self.log_panel = LogPanel(50, 280, WINDOW_WIDTH - 100, 200, self.small_font)
         self.attack_button = Button(50, WINDOW_HEIGHT - 100, 200, 50, "Attack", DARK_BLUE, BLUE)
         self.special_button = Button(300, WINDOW_HEIGHT - 100, 200, 50, "Special Ability", PURPLE, DARK_PURPLE)
         self.class_buttons = [
@@ -29,14 +57,36 @@ class Game:
         ]
         self.player = None
         self.enemy = None
+        self.battle = None
+        self.enemy_policy = enemy_policy
+        self.seed = seed
+        self.enemy_thinking = False
         self.combat_log = []
         self.current_turn = 0
         self.game_state = "character_select"
         self.screen_shake = 0
         self.shake_duration = 0
         self.shake_intensity = 0
+        self.endless = endless
+        self.store = store
+        self.saver = saver
+        self.history = History()
+        self.advisor = advisor
+        self.enemy_pool = EnemyPool()
         self.enemy_level = 1
-        self.enemy_xp_reward = 50
+        self.enemy_xp_reward = wave_xp_reward(self.enemy_level)
+        self.party = None
+        self.party_view = None
+        self.replay = None
+        self.replay_speed = 1
+        self.replay_progress = 0
+        self.auto_policy = None
+        self.auto_class = None
+        self.auto_battles = 0
+        self.render_every = 1
+        self.auto_played = 0
+        self.auto_won = 0
+        self.auto_started = 0
 
     def create_background(self):
         background = pygame.Surface((WINDOW_WIDTH, WINDOW_HEIGHT))
@@ -56,9 +106,10 @@ class Game:
     def get_shake_offset(self):
         if self.shake_duration > 0:
             self.shake_duration -= 1
+            rng = self.battle.random.cosmetic
             return (
-                random.randint(-self.shake_intensity, self.shake_intensity),
-                random.randint(-self.shake_intensity, self.shake_intensity)
+                rng.randint(-self.shake_intensity, self.shake_intensity),
+                rng.randint(-self.shake_intensity, self.shake_intensity)
             )
         return (0, 0)
 
@@ -125,93 +176,368 @@ class Game:
         self.screen.blit(self.background, shake_offset)
         self.player.update()
         self.enemy.update()
-        self.player.draw(self.screen)
-        self.enemy.draw(self.screen)
+        self.player.view.update()
+        self.enemy.view.update()
+        self.player.view.draw(self.screen)
+        self.enemy.view.draw(self.screen)
         self.draw_health_bar(self.player, 50, 50)
-        self.draw_text(f"Attack: {self.player.attack}", 50, 100, LIGHT_BLUE)
-        self.draw_text(f"Defense: {self.player.defense}", 50, 130, LIGHT_BLUE)
+        self.screen.blit(self.player.view.stat_label(self.font, LIGHT_BLUE), (50, 100))
         if self.player.special_cooldown > 0:
             self.draw_text(f"Special Cooldown: {self.player.special_cooldown}", 50, 160, RED)
         self.draw_health_bar(self.enemy, WINDOW_WIDTH - 350, 50)
-        self.draw_text(f"Attack: {self.enemy.attack}", WINDOW_WIDTH - 350, 100, LIGHT_BLUE)
-        self.draw_text(f"Defense: {self.enemy.defense}", WINDOW_WIDTH - 350, 130, LIGHT_BLUE)
+        self.screen.blit(self.enemy.view.stat_label(self.font, LIGHT_BLUE), (WINDOW_WIDTH - 350, 100))
         if self.enemy.special_cooldown > 0:
             self.draw_text(f"Special Cooldown: {self.enemy.special_cooldown}", WINDOW_WIDTH - 350, 160, RED)
+        if self.endless:
+            self.draw_text(f"Wave {self.enemy_level}", WINDOW_WIDTH // 2, 70, GOLD, self.font, True)
         self.draw_text("Combat Log:", 50, 250, GOLD)
-        log_background = pygame.Surface((WINDOW_WIDTH - 100, 200))
-        log_background.fill((30, 30, 50))
-        log_background.set_alpha(200)
-        self.screen.blit(log_background, (50, 280))
-        for i, entry in enumerate(self.combat_log[-5:]):
-            self.draw_text(entry, 70, 300 + i * 30, WHITE, self.small_font)
-        self.attack_button.draw(self.screen, self.font)
-        self.special_button.draw(self.screen, self.font)
+        self.log_panel.draw(self.screen)
+        if self.game_state == "replay":
+            status = f"Replay {self.replay_speed}x - Turn {self.battle.current_turn}/{self.replay.turns}"
+            self.draw_text(status, 50, WINDOW_HEIGHT - 90, GOLD)
+            self.draw_text("Up/Down: speed   Left/Right: seek", 50, WINDOW_HEIGHT - 50, SILVER, self.small_font)
+        else:
+            self.attack_button.draw(self.screen, self.font)
+            self.special_button.draw(self.screen, self.font)
+            if self.history:
+                self.draw_text("U: undo turn", 550, WINDOW_HEIGHT - 85, SILVER, self.small_font)
+            if self.advisor is not None and not self.enemy_thinking:
+                self.draw_advice()
+
+    def draw_advice(self):
+        buttons = (('attack', self.attack_button), ('special', self.special_button))
+        hovered = any(button.is_hovered for action, button in buttons)
+        self.advisor.update(self.battle, hovered)
+        if not hovered:
+            return
+        for action, button in buttons:
+            odds = self.advisor.odds(action)
+            if not self.advisor.usable(action):
+                text = "On cooldown"
+            elif odds is not None:
+                text = f"Win {odds[0]:.0%} ({odds[1]} sims)"
+            elif self.advisor.unavailable():
+                text = "Odds unavailable"
+            else:
+                text = "Simulating..."
+            self.draw_text(text, button.rect.x, button.rect.y - 30, GOLD, self.small_font)
 
     def execute_turn(self, action):
-        self.current_turn += 1
-        self.combat_log.append(f"--- Turn {self.current_turn} ---")
-        if action == 'attack':
-            damage = self.player.attack
-            actual_damage, message = self.enemy.take_damage(damage)
-            self.combat_log.append(f"{self.player.name} attacks for {actual_damage} damage! {message}")
-            self.apply_screen_shake(5, 10)
-        elif action == 'special':
-            success, message = self.player.use_special_ability(self.enemy)
-            self.combat_log.append(message)
-            self.apply_screen_shake(10, 15)
+        self.history.push(self.battle)
+        self.battle.player_turn(action)
+        self.current_turn = self.battle.current_turn
         if not self.enemy.is_alive():
-            if self.player.gain_xp(self.enemy_xp_reward):
-                self.combat_log.append(f"{self.player.name} leveled up to level {self.player.level_system.level}!")
-            self.combat_log.append(f"{self.enemy.name} has been defeated!")
-            self.game_state = "game_over"
+            self.enemy_defeated()
             return
-        if random.random() < 0.3 and self.enemy.special_cooldown == 0:
-            success, message = self.enemy.use_special_ability(self.player)
-            self.combat_log.append(message)
-            self.apply_screen_shake(10, 15)
+        if hasattr(self.enemy_policy, 'start_thinking'):
+            self.player.view.sprite.is_attacking = True
+            self.enemy_policy.start_thinking(self.battle)
+            self.enemy_thinking = True
+            return
+        self.resolve_enemy_turn()
+
+    def resolve_enemy_turn(self):
+        self.enemy_thinking = False
+        self.battle.enemy_turn()
+        if not self.player.is_alive():
+            self.record_result(False)
+            self.end_session()
+        elif not self.enemy.is_alive():
+            self.enemy_defeated()
         else:
-            damage = self.enemy.attack
-            actual_damage, message = self.player.take_damage(damage)
-            self.combat_log.append(f"{self.enemy.name} attacks for {actual_damage} damage! {message}")
+            self.autosave()
+
+    def record_result(self, won):
+        if self.store is not None:
+            self.store.save(self.player, won)
+
+    def enemy_defeated(self):
+        self.record_result(True)
+        if self.endless:
+            self.next_wave()
+            self.autosave()
+        else:
+            self.end_session()
+
+    def end_session(self):
+        self.game_state = "game_over"
+        if self.saver is not None:
+            self.saver.clear()
+
+    def autosave(self):
+        if self.saver is not None:
+            self.saver.save(self)
+
+    def next_wave(self):
+        self.enemy_pool.release(self.enemy)
+        self.enemy_level += 1
+        self.enemy_xp_reward = wave_xp_reward(self.enemy_level)
+        self.enemy = self.enemy_pool.acquire(self.enemy_level)
+        self.place_view(self.enemy, 3 * WINDOW_WIDTH // 4 - 50)
+        self.battle.next_wave(self.enemy, self.enemy_xp_reward)
+        self.history.clear()
+
+    def undo_turn(self):
+        if self.enemy_thinking or not self.history.undo(self.battle):
+            return
+        self.current_turn = self.battle.current_turn
+        self.log_panel.attach(self.battle.combat_log)
+        self.autosave()
+
+    def update_enemy_thinking(self):
+        if self.enemy_thinking and not self.player.view.sprite.is_attacking and self.shake_duration == 0:
+            self.resolve_enemy_turn()
+
+    def on_combat_event(self, event):
+        if event.kind == SPECIAL:
+            self.apply_screen_shake(10, 15)
+        elif event.kind == ATTACK:
             self.apply_screen_shake(5, 10)
-        self.player.update_cooldowns()
-        self.enemy.update_cooldowns()
-        if not self.player.is_alive():
-            self.combat_log.append(f"{self.player.name} has been defeated!")
+
+    def show_battle(self, battle):
+        self.battle = battle
+        self.player = battle.player
+        self.enemy = battle.enemy
+        self.place_view(self.player, WINDOW_WIDTH // 4 - 50)
+        self.place_view(self.enemy, 3 * WINDOW_WIDTH // 4 - 50)
+        self.combat_log = battle.combat_log
+        self.log_panel.attach(battle.combat_log)
+        self.current_turn = battle.current_turn
+        self.history.clear()
+        battle.events.subscribe(self.on_combat_event)
+
+    def place_view(self, character, x):
+        if character.view is None:
+            CharacterView(character)
+        sprite = character.view.sprite
+        sprite.target_position = [x, WINDOW_HEIGHT // 2 - 75]
+        sprite.reset()
+
+    def start_battle(self, character_type):
+        if self.store is not None:
+            player = self.store.load_best(character_type)
+        else:
+            player = Character(character_type, CHARACTER_STATS[character_type])
+        enemy = self.enemy_pool.acquire(self.enemy_level)
+        seed = self.seed
+        if self.auto_policy is not None and seed is not None:
+            seed += self.auto_played
+        self.show_battle(BattleSystem(player, enemy, self.enemy_xp_reward, self.enemy_policy, seed))
+        self.game_state = "battle"
+
+    def resume_battle(self, sections, lines):
+        battle, self.enemy_level, self.endless = restore_battle(
+            sections, lines, self.enemy_policy, self.enemy_pool.acquire(1))
+        self.enemy_xp_reward = battle.xp_reward
+        self.show_battle(battle)
+        self.game_state = "battle"
+
+    def start_party(self, hero_count, enemy_count):
+        heroes = [Character(name, CHARACTER_STATS[name])
+                  for name in (PLAYER_CLASSES[i % len(PLAYER_CLASSES)] for i in range(hero_count))]
+        enemies = [self.enemy_pool.acquire(self.enemy_level) for _ in range(enemy_count)]
+        self.party = PartyBattle(heroes, enemies, self.seed)
+        self.party_view = PartyView(self.party, WINDOW_WIDTH // 2 - 100, 340)
+        self.battle = self.party
+        self.combat_log = CombatLog()
+        self.party.events.subscribe(self.combat_log.record)
+        self.log_panel = LogPanel(50, 490, WINDOW_WIDTH - 100, 110, self.small_font,
+                                  visible_lines=3, line_height=30, padding=10)
+        self.log_panel.attach(self.combat_log)
+        self.game_state = "party"
+
+    def execute_party_turn(self):
+        self.party.execute_turn()
+        self.apply_screen_shake(5, 10)
+        if self.party.is_battle_over():
             self.game_state = "game_over"
 
+    def draw_party_screen(self):
+        shake_offset = self.get_shake_offset()
+        self.screen.blit(self.background, shake_offset)
+        self.party_view.draw(self.screen)
+        for side, name in enumerate(SIDE_NAMES):
+            x = 50 if side == HEROES else WINDOW_WIDTH // 2 + 50
+            self.draw_text(f"{name}: {self.party.survivors(side)} standing", x, 50, GOLD)
+        self.draw_text(f"Turn {self.party.current_turn}", WINDOW_WIDTH // 2, 70, WHITE, self.font, True)
+        self.log_panel.draw(self.screen)
+        self.attack_button.draw(self.screen, self.font)
+
+    def start_replay(self, replay, speed=1):
+        self.replay = replay
+        self.replay_speed = speed
+        self.seek_replay(0)
+        self.game_state = "replay"
+
+    def seek_replay(self, turn):
+        self.show_battle(self.replay.seek(turn))
+        self.replay_progress = 0
+
+    def change_replay_speed(self, direction):
+        index = REPLAY_SPEEDS.index(self.replay_speed) + direction
+        self.replay_speed = REPLAY_SPEEDS[max(0, min(index, len(REPLAY_SPEEDS) - 1))]
+
+    def handle_replay_key(self, key):
+        if key == pygame.K_UP:
+            self.change_replay_speed(1)
+        elif key == pygame.K_DOWN:
+            self.change_replay_speed(-1)
+        elif key == pygame.K_RIGHT:
+            self.seek_replay(self.battle.current_turn + self.replay.keyframe_interval)
+        elif key == pygame.K_LEFT:
+            self.seek_replay(self.battle.current_turn - self.replay.keyframe_interval)
+
+    def update_replay(self):
+        self.replay_progress += self.replay_speed / REPLAY_TURN_FRAMES
+        while self.replay_progress >= 1:
+            self.replay_progress -= 1
+            if not step(self.battle):
+                self.replay_progress = 0
+                break
+            self.current_turn = self.battle.current_turn
+
+    def start_auto(self, class_name, policy='greedy', battles=0, render_every=1):
+        self.auto_policy = AUTO_POLICIES[policy]
+        self.auto_class = class_name
+        self.auto_battles = battles
+        self.render_every = render_every
+        self.auto_started = time.perf_counter()
+        self.start_battle(class_name)
+
+    def update_auto(self):
+        deadline = time.perf_counter() + AUTO_FRAME_SECONDS
+        turns = 0
+        while turns < self.render_every if self.render_every else time.perf_counter() < deadline:
+            self.execute_turn(self.auto_policy(self.player))
+            if self.enemy_thinking:
+                self.resolve_enemy_turn()
+            turns += 1
+            if self.game_state == "game_over":
+                self.finish_auto_battle()
+                if self.game_state != "battle":
+                    return
+
+    def finish_auto_battle(self):
+        self.auto_played += 1
+        self.auto_won += self.player.is_alive()
+        if self.auto_battles and self.auto_played >= self.auto_battles:
+            self.game_state = "auto_done"
+            return
+        self.enemy_pool.release(self.enemy)
+        self.enemy_level = 1
+        self.enemy_xp_reward = wave_xp_reward(self.enemy_level)
+        self.start_battle(self.auto_class)
+
+    def auto_summary(self):
+        elapsed = max(time.perf_counter() - self.auto_started, 1e-9)
+        return (f"Auto {self.auto_class}: {self.auto_played} battles, {self.auto_won} won, "
+                f"{self.auto_played / elapsed:.0f} battles/s")
+
+    def draw_auto_screen(self):
+        if self.render_every:
+            self.draw_battle_screen()
+        else:
+            self.screen.blit(self.background, (0, 0))
+        self.draw_text(self.auto_summary(), WINDOW_WIDTH // 2, 20, GOLD, self.small_font, True)
+
+    def quit(self):
+        if self.store is not None:
+            self.store.close()
+        if self.saver is not None:
+            self.saver.close()
+        if self.advisor is not None:
+            self.advisor.close()
+        pygame.quit()
+        sys.exit()
+
     def run(self):
-        while True:
+        while self.game_state != "auto_done":
             for event in pygame.event.get():
                 if event.type == pygame.QUIT:
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
                 if self.game_state == "character_select":
                     for i, button in enumerate(self.class_buttons):
                         if button.handle_event(event):
-                            character_type = ["Warrior", "Mage", "Archer", "Rogue", "Paladin"][i]
-                            self.player = Character(character_type, CHARACTER_STATS[character_type])
-                            self.enemy = Character("Enemy", CHARACTER_STATS["Enemy"])
-                            self.player.sprite.position = [WINDOW_WIDTH // 4 - 50, WINDOW_HEIGHT // 2 - 75]
-                            self.player.sprite.target_position = self.player.sprite.position.copy()
-                            self.enemy.sprite.position = [3 * WINDOW_WIDTH // 4 - 50, WINDOW_HEIGHT // 2 - 75]
-                            self.enemy.sprite.target_position = self.enemy.sprite.position.copy()
-                            self.game_state = "battle"
-                elif self.game_state == "battle":
-                    if self.attack_button.handle_event(event):
+                            character_type = PLAYER_CLASSES[i]
+                            self.start_battle(character_type)
+                elif self.game_state == "battle" and self.auto_policy is None:
+                    if self.attack_button.handle_event(event) and not self.enemy_thinking:
                         self.execute_turn('attack')
-                    elif self.special_button.handle_event(event):
+                    elif self.special_button.handle_event(event) and not self.enemy_thinking:
                         self.execute_turn('special')
+                    elif event.type == pygame.KEYDOWN and event.key in (pygame.K_u, pygame.K_BACKSPACE):
+                        self.undo_turn()
+                elif self.game_state == "party":
+                    if self.attack_button.handle_event(event):
+                        self.execute_party_turn()
+                elif self.game_state == "replay":
+                    if event.type == pygame.KEYDOWN:
+                        self.handle_replay_key(event.key)
                 elif self.game_state == "game_over":
-                    pygame.quit()
-                    sys.exit()
+                    self.quit()
             if self.game_state == "character_select":
                 self.draw_character_select()
+            elif self.game_state == "battle" and self.auto_policy is not None:
+                self.update_auto()
+                self.draw_auto_screen()
             elif self.game_state == "battle":
                 self.draw_battle_screen()
+                self.update_enemy_thinking()
+            elif self.game_state == "party":
+                self.draw_party_screen()
+            elif self.game_state == "replay":
+                self.draw_battle_screen()
+                self.update_replay()
             pygame.display.flip()
-            self.clock.tick(60)
+            self.clock.tick(0 if self.auto_policy is not None else 60)
 
 if __name__ == "__main__":
-    game = Game()
-    game.run() 
\ No newline at end of file
+    multiprocessing.freeze_support()
+    parser = argparse.ArgumentParser(description="Epic RPG Battle")
+    parser.add_argument("--hard", action="store_true", help="use the search-based enemy")
+    parser.add_argument("--mcts", action="store_true", help="use the background MCTS enemy")
+    parser.add_argument("--think-ms", type=float, default=None)
+    parser.add_argument("--seed", type=int, default=None, help="seed the battle for a reproducible run")
+    parser.add_argument("--endless", action="store_true", help="fight endless waves of scaling enemies")
+    parser.add_argument("--party", type=int, nargs=2, metavar=("HEROES", "ENEMIES"), default=None,
+                        help="fight a party-vs-horde battle")
+    parser.add_argument("--db", default="heroes.db", help="SQLite file that keeps hero progress")
+    parser.add_argument("--save", default="session.sav", help="file the current battle is autosaved to")
+    parser.add_argument("--resume", action="store_true", help="continue the battle in the save file")
+    parser.add_argument("--advisor", action="store_true", help="show simulated win odds when hovering an action")
+    parser.add_argument("--auto", choices=PLAYER_CLASSES, default=None,
+                        help="let a scripted policy play this class, battle after battle")
+    parser.add_argument("--auto-policy", choices=sorted(AUTO_POLICIES), default='greedy')
+    parser.add_argument("--auto-battles", type=int, default=0, help="quit after this many battles (0 runs forever)")
+    parser.add_argument("--render-every", type=int, default=1,
+                        help="turns resolved per drawn frame in auto mode (0 draws only the summary)")
+    parser.add_argument("--replay", default=None, help="play a battle from a replay archive")
+    parser.add_argument("--replay-index", type=int, default=0)
+    parser.add_argument("--speed", type=int, choices=REPLAY_SPEEDS, default=1)
+    args = parser.parse_args()
+    pygame.init()
+    if args.replay is not None:
+        archive = ReplayArchive(args.replay)
+        game = Game()
+        game.start_replay(archive[args.replay_index], args.speed)
+        game.run()
+    enemy_policy = None
+    if args.mcts:
+        enemy_policy = MCTSEnemy(time_budget_ms=args.think_ms or 150)
+    elif args.hard:
+        enemy_policy = ExpectimaxEnemy(time_budget_ms=args.think_ms or 8)
+    session = read_session(args.save) if args.resume and os.path.exists(args.save) else None
+    advisor = ActionAdvisor(seed=args.seed or 0) if args.advisor else None
+    if args.auto is not None:
+        game = Game(enemy_policy, args.seed, args.endless, advisor=advisor)
+    else:
+        game = Game(enemy_policy, args.seed, args.endless, HeroStore(args.db), SessionSaver(args.save), advisor)
+    if args.party is not None:
+        game.start_party(*args.party)
+    elif args.auto is not None:
+        game.start_auto(args.auto, args.auto_policy, args.auto_battles, args.render_every)
+    elif session is not None:
+        game.resume_battle(*session)
+    game.run()
+    print(game.auto_summary())
+    game.quit() 
\ No newline at end of file
@@ -0,0 +1,191 @@
+import argparse
+import asyncio
+import time
+
+from src.components.battle_system import BattleSystem
+from src.components.character import Character
+from src.components.class_registry import CHARACTER_STATS, PLAYER_CLASSES
+from src.components.waves import EnemyPool, wave_xp_reward
+from src.utils.constants import LOG_CAPACITY
+from src.utils.rng import SEED_BITS
+
+try:
+    import resource
+except ImportError:
+    resource = None
+
+DEFAULT_PORT = 7878
+BACKLOG = 4096
+ACTIONS = {'ATTACK': 'attack', 'SPECIAL': 'special'}
+CLASS_NAMES = {name.lower(): name for name in PLAYER_CLASSES}
+
+
+def raise_file_limit():
+    if resource is None:
+        return
+    soft, hard = resource.getrlimit(resource.RLIMIT_NOFILE)
+    if soft < hard:
+        resource.setrlimit(resource.RLIMIT_NOFILE, (hard, hard))
+
+
+async def read_line(reader):
+    try:
+        return await reader.readuntil(b"\n")
+    except asyncio.IncompleteReadError as error:
+        return error.partial
+    except asyncio.LimitOverrunError as error:
+        await skip_line(reader, error.consumed)
+        raise ValueError("line too long")
+
+
+async def skip_line(reader, consumed):
+    while True:
+        await reader.readexactly(consumed)
+        try:
+            await reader.readuntil(b"\n")
+            return
+        except asyncio.LimitOverrunError as error:
+            consumed = error.consumed
+
+
+class BattleSession:
+    def __init__(self, enemy_pool):
+        self.enemy_pool = enemy_pool
+        self.battle = None
+        self.shown = 0
+
+    def start(self, class_name, seed=None):
+        if class_name.lower() not in CLASS_NAMES:
+            raise ValueError(f"unknown class {class_name!r}, expected one of {', '.join(PLAYER_CLASSES)}")
+        if seed is not None and not 0 <= seed < 1 << SEED_BITS:
+            raise ValueError(f"seed must be between 0 and {(1 << SEED_BITS) - 1}")
+        class_name = CLASS_NAMES[class_name.lower()]
+        self.release()
+        player = Character(class_name, CHARACTER_STATS[class_name])
+        enemy = self.enemy_pool.acquire()
+        try:
+            self.battle = BattleSystem(player, enemy, wave_xp_reward(1), seed=seed)
+        except Exception:
+            self.enemy_pool.release(enemy)
+            raise
+        self.shown = 0
+        return [self.state()]
+
+    def turn(self, action):
+        if self.battle is None:
+            raise ValueError("no battle in progress, send START first")
+        if self.battle.is_battle_over():
+            raise ValueError("the battle is over, send START for a new one")
+        self.battle.execute_turn(action)
+        log = self.battle.combat_log
+        lines = ["LOG " + line for line in log.tail(min(log.total - self.shown, LOG_CAPACITY))]
+        self.shown = log.total
+        lines.append(self.result() if self.battle.is_battle_over() else self.state())
+        return lines
+
+    def state(self):
+        if self.battle is None:
+            raise ValueError("no battle in progress, send START first")
+        player, enemy = self.battle.player, self.battle.enemy
+        return (f"STATE {self.battle.current_turn} {player.health:g} {player.max_health:g} {enemy.health:g} "
+                f"{enemy.max_health:g} {player.special_cooldown} {enemy.special_cooldown}")
+
+    def result(self):
+        player = self.battle.player
+        outcome = 'WIN' if player.is_alive() else 'LOSS'
+        return f"RESULT {outcome} {self.battle.current_turn} {player.level_system.level} {player.level_system.xp}"
+
+    def release(self):
+        if self.battle is not None:
+            self.enemy_pool.release(self.battle.enemy)
+            self.battle = None
+
+
+class BattleServer:
+    def __init__(self):
+        self.enemy_pool = EnemyPool()
+        self.sessions = 0
+        self.peak_sessions = 0
+        self.turns = 0
+        self.started = time.perf_counter()
+
+    async def handle(self, reader, writer):
+        session = BattleSession(self.enemy_pool)
+        self.sessions += 1
+        self.peak_sessions = max(self.peak_sessions, self.sessions)
+        try:
+            while True:
+                try:
+                    line = await read_line(reader)
+                except ValueError as error:
+                    reply = [f"ERROR {error}"]
+                else:
+                    if not line:
+                        break
+                    reply = self.dispatch(session, line.decode('utf-8', 'replace').split())
+                writer.write(("\n".join(reply) + "\n").encode('utf-8'))
+                if reply[-1] == 'BYE':
+                    break
+                await writer.drain()
+        except (ConnectionError, asyncio.IncompleteReadError):
+            pass
+        finally:
+            session.release()
+            self.sessions -= 1
+            writer.close()
+
+    def dispatch(self, session, words):
+        if not words:
+            return ["ERROR empty command"]
+        command = words[0].upper()
+        try:
+            if command in ACTIONS:
+                self.turns += 1
+                return session.turn(ACTIONS[command])
+            if command == 'START':
+                return session.start(words[1] if len(words) > 1 else PLAYER_CLASSES[0],
+                                     int(words[2]) if len(words) > 2 else None)
+            if command == 'STATE':
+                return [session.state()]
+            if command == 'CLASSES':
+                return ["CLASSES " + " ".join(PLAYER_CLASSES)]
+            if command == 'STATS':
+                return [self.stats()]
+            if command == 'QUIT':
+                return ["BYE"]
+        except ValueError as error:
+            return [f"ERROR {error}"]
+        return [f"ERROR unknown command {words[0]!r}"]
+
+    def stats(self):
+        return (f"STATS sessions={self.sessions} peak={self.peak_sessions} turns={self.turns} "
+                f"cpu={time.process_time():.3f} uptime={time.perf_counter() - self.started:.3f}")
+
+
+async def serve(server, host='127.0.0.1', port=DEFAULT_PORT, path=None):
+    if path is not None:
+        listener = await asyncio.start_unix_server(server.handle, path, backlog=BACKLOG)
+    else:
+        listener = await asyncio.start_server(server.handle, host, port, backlog=BACKLOG)
+    async with listener:
+        await listener.serve_forever()
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Headless battle server speaking a line-based protocol")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="listen on this Unix socket instead of TCP")
+    args = parser.parse_args()
+
+    raise_file_limit()
+    where = args.unix or f"{args.host}:{args.port}"
+    print(f"Serving battles on {where}")
+    try:
+        asyncio.run(serve(BattleServer(), args.host, args.port, args.unix))
+    except KeyboardInterrupt:
+        pass
+
+
+if __name__ == "__main__":
+    main()
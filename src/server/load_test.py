@@ -0,0 +1,115 @@
+import argparse
+import asyncio
+import random
+import time
+
+import numpy as np
+from src.components.class_registry import PLAYER_CLASSES
+from src.server.battle_server import DEFAULT_PORT, raise_file_limit
+
+ACTIONS = ('ATTACK', 'SPECIAL')
+
+
+async def connect(host, port, path):
+    if path is not None:
+        return await asyncio.open_unix_connection(path)
+    return await asyncio.open_connection(host, port)
+
+
+async def request(reader, writer, command):
+    writer.write(command.encode('utf-8') + b"\n")
+    await writer.drain()
+    while True:
+        line = await reader.readline()
+        if not line:
+            raise ConnectionError("server closed the connection")
+        line = line.decode('utf-8').rstrip("\n")
+        if not line.startswith("LOG "):
+            return line
+
+
+def parse_stats(line):
+    return {key: float(value) for key, value in (field.split("=") for field in line.split()[1:])}
+
+
+class LoadTest:
+    def __init__(self, host, port, path, think_ms, seed=None):
+        self.host = host
+        self.port = port
+        self.path = path
+        self.think = think_ms / 1000
+        self.rng = random.Random(seed)
+        self.latencies = []
+        self.battles = 0
+        self.errors = 0
+        self.connected = 0
+
+    async def run_session(self, delay, deadline):
+        await asyncio.sleep(delay)
+        try:
+            reader, writer = await connect(self.host, self.port, self.path)
+        except OSError:
+            self.errors += 1
+            return
+        self.connected += 1
+        try:
+            while time.perf_counter() < deadline:
+                await request(reader, writer, f"START {self.rng.choice(PLAYER_CLASSES)}")
+                while time.perf_counter() < deadline:
+                    if self.think:
+                        await asyncio.sleep(min(self.rng.expovariate(1 / self.think),
+                                                max(0.0, deadline - time.perf_counter())))
+                    start = time.perf_counter()
+                    reply = await request(reader, writer, self.rng.choice(ACTIONS))
+                    self.latencies.append(time.perf_counter() - start)
+                    if reply.startswith("ERROR"):
+                        self.errors += 1
+                    if reply.startswith("RESULT"):
+                        self.battles += 1
+                        break
+            await request(reader, writer, "QUIT")
+        except ConnectionError:
+            self.errors += 1
+        finally:
+            writer.close()
+
+    async def run(self, sessions, duration, ramp):
+        reader, writer = await connect(self.host, self.port, self.path)
+        before = parse_stats(await request(reader, writer, "STATS"))
+        started = time.perf_counter()
+        deadline = started + ramp + duration
+        await asyncio.gather(*(self.run_session(ramp * i / sessions, deadline) for i in range(sessions)))
+        after = parse_stats(await request(reader, writer, "STATS"))
+        await request(reader, writer, "QUIT")
+        writer.close()
+        return time.perf_counter() - started, after['cpu'] - before['cpu'], after['peak']
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Load generator for the battle server")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=DEFAULT_PORT)
+    parser.add_argument("--unix", default=None, help="connect to this Unix socket instead of TCP")
+    parser.add_argument("--sessions", type=int, default=1000)
+    parser.add_argument("--duration", type=float, default=10.0, help="seconds to keep every session busy")
+    parser.add_argument("--ramp", type=float, default=2.0, help="seconds over which sessions connect")
+    parser.add_argument("--think-ms", type=float, default=0.0, help="mean pause before each turn")
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    raise_file_limit()
+    test = LoadTest(args.host, args.port, args.unix, args.think_ms, args.seed)
+    elapsed, cpu, peak = asyncio.run(test.run(args.sessions, args.duration, args.ramp))
+    latencies = np.array(test.latencies) * 1000
+    cores = cpu / elapsed
+    print(f"{test.connected} sessions (server peak {peak:.0f}), {len(latencies)} turns in {elapsed:.1f}s "
+          f"({len(latencies) / elapsed:.0f} turns/s), {test.battles} battles, {test.errors} errors")
+    if len(latencies):
+        print(f"Turn latency: p50 {np.percentile(latencies, 50):.2f} ms, p99 {np.percentile(latencies, 99):.2f} ms, "
+              f"max {latencies.max():.2f} ms")
+    print(f"Server CPU: {cpu:.2f}s ({cores:.2f} cores busy), {test.connected / max(cores, 1e-9):.0f} sessions "
+          f"per core, {len(latencies) / max(cpu, 1e-9):.0f} turns per CPU second")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,161 @@
+import multiprocessing
+import os
+from collections import Counter, OrderedDict
+from concurrent.futures import ProcessPoolExecutor
+from concurrent.futures.process import BrokenProcessPool
+
+import numpy as np
+from src.components.battle_state import fork
+from src.simulation.monte_carlo import ENEMY_SPECIAL_CHANCE, MAX_TURNS, STEALTH_CRIT_CHANCE, _Side, _simulate_chunk
+from src.simulation.solver import effect_turns
+from src.utils.rng import SEED_BITS
+
+ACTIONS = ('attack', 'special')
+BATCH_SIZE = 2000
+MAX_BATTLES = 40000
+CACHE_SIZE = 256
+FIRST_TURNS = 32
+
+
+def side_state(character):
+    return (character.name, character.max_health, character.attack, character.defense,
+            character.base_value('crit_chance'), character.health, character.special_cooldown,
+            effect_turns(character, "Burn"), effect_turns(character, "Blessed"), effect_turns(character, "Stealth"))
+
+
+def battle_state(battle):
+    return side_state(battle.player), side_state(battle.enemy)
+
+
+def _side(state, n, special_chance):
+    name, max_health, attack, defense, crit_chance, health, cooldown, burn, bless, stealth = state
+    stats = {'health': max_health, 'attack': attack, 'defense': defense, 'crit_chance': crit_chance}
+    side = _Side(name, stats, n, special_chance)
+    side.health[:] = health
+    side.cooldown[:] = cooldown
+    side.burn_left[:] = burn
+    side.bless_left[:] = bless
+    side.stealth_left[:] = stealth
+    if stealth:
+        side.crit_chance[:] = STEALTH_CRIT_CHANCE
+    return side
+
+
+def estimate(branch, action, battles, seed, batch, first_turns=FIRST_TURNS):
+    rng = np.random.default_rng(np.random.SeedSequence(seed, spawn_key=(batch,)))
+    shares = np.full(first_turns, battles // first_turns)
+    shares[:battles % first_turns] += 1
+    wins = 0
+    outcomes = Counter()
+    for share in shares.tolist():
+        trial = fork(branch, seed=int(rng.integers(1 << SEED_BITS)))
+        trial.execute_turn(action)
+        if trial.is_battle_over():
+            wins += share if trial.player.is_alive() else 0
+        else:
+            outcomes[battle_state(trial)] += share
+    for state, n in outcomes.items():
+        player = _side(state[0], n, 1.0)
+        enemy = _side(state[1], n, ENEMY_SPECIAL_CHANCE)
+        wins += int(_simulate_chunk(player, enemy, n, rng, MAX_TURNS - 1).won.sum())
+    return wins
+
+
+class ActionAdvisor:
+    def __init__(self, workers=None, batch_size=BATCH_SIZE, max_battles=MAX_BATTLES, seed=0,
+                 cache_size=CACHE_SIZE):
+        self.workers = workers or os.cpu_count()
+        self.batch_size = batch_size
+        self.max_battles = max_battles
+        self.seed = seed
+        self.cache_size = cache_size
+        self.pool = ProcessPoolExecutor(max_workers=self.workers, mp_context=multiprocessing.get_context('spawn'))
+        self.cache = OrderedDict()
+        self.state = None
+        self.branch = None
+        self.futures = []
+
+    def update(self, battle, active=True):
+        state = battle_state(battle)
+        if state != self.state:
+            self.cancel()
+            self.state = state
+            self.branch = fork(battle)
+        self._collect()
+        if active:
+            self._submit()
+
+    def odds(self, action):
+        tally = self.cache.get(self.state)
+        if tally is None or tally[action][1] == 0:
+            return None
+        wins, battles = tally[action]
+        return wins / battles, battles
+
+    def unavailable(self):
+        tally = self.cache.get(self.state)
+        return tally is not None and tally['failed']
+
+    def usable(self, action):
+        return action != 'special' or self.state[0][6] == 0
+
+    def cancel(self):
+        for future, state, action in self.futures:
+            future.cancel()
+        self.futures = [entry for entry in self.futures if not entry[0].cancelled()]
+
+    def close(self):
+        if self.pool is None:
+            return
+        self.pool.shutdown(wait=False, cancel_futures=True)
+        self.pool = None
+
+    def _tally(self, state):
+        tally = self.cache.get(state)
+        if tally is None:
+            tally = self.cache[state] = {action: [0, 0] for action in ACTIONS}
+            tally['batches'] = 0
+            tally['failed'] = False
+            while len(self.cache) > self.cache_size:
+                self.cache.popitem(last=False)
+        self.cache.move_to_end(state)
+        return tally
+
+    def _collect(self):
+        pending = []
+        for entry in self.futures:
+            future, state, action = entry
+            if not future.done():
+                pending.append(entry)
+            elif not future.cancelled() and state in self.cache:
+                try:
+                    wins = future.result()
+                except Exception:
+                    self.cache[state]['failed'] = True
+                    continue
+                counts = self.cache[state][action]
+                counts[0] += wins
+                counts[1] += self.batch_size
+        self.futures = pending
+
+    def _submit(self):
+        tally = self._tally(self.state)
+        if tally['failed']:
+            return
+        queued = {action: tally[action][1] for action in ACTIONS}
+        for future, state, action in self.futures:
+            if state == self.state:
+                queued[action] += self.batch_size
+        while len(self.futures) < self.workers:
+            wanted = [action for action in ACTIONS if self.usable(action) and queued[action] < self.max_battles]
+            if not wanted:
+                return
+            action = min(wanted, key=queued.get)
+            tally['batches'] += 1
+            try:
+                future = self.pool.submit(estimate, self.branch, action, self.batch_size, self.seed, tally['batches'])
+            except BrokenProcessPool:
+                tally['failed'] = True
+                return
+            self.futures.append((future, self.state, action))
+            queued[action] += self.batch_size
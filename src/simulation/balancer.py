@@ -0,0 +1,249 @@
+import argparse
+import json
+import math
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor
+
+import numpy as np
+from src.components.class_registry import CHARACTER_STATS, CLASSES_PATH, LEVEL_UP_GROWTH, PLAYER_CLASSES
+from src.simulation.monte_carlo import RULES_VERSION, simulate, opponent_stats, stats_at_level
+
+DEFAULT_TARGETS = {1: 0.55, 3: 0.7, 5: 0.8, 8: 0.9}
+STAT_NAMES = ('health', 'attack', 'defense')
+STEPS = (5, 1, 1, 1, 1, 1)
+MINIMUMS = (10, 1, 0, 0, 0, 0)
+INITIAL_SCALE = 8
+MAX_SCALE = 64
+Z_95 = 1.959964
+
+
+def candidate_from_tables(class_name):
+    base = CHARACTER_STATS[class_name]
+    growth = LEVEL_UP_GROWTH.get(class_name, {})
+    return tuple(base[name] for name in STAT_NAMES) + tuple(growth.get(name, 0) for name in STAT_NAMES)
+
+
+def candidate_stats(class_name, candidate, level):
+    base = dict(zip(STAT_NAMES, candidate[:3]))
+    growth = dict(zip(STAT_NAMES, candidate[3:]))
+    growth['crit_chance'] = LEVEL_UP_GROWTH.get(class_name, {}).get('crit_chance', 0)
+    return stats_at_level(base, growth, level)
+
+
+def neighbours(candidate, scale):
+    found = []
+    for i, step in enumerate(STEPS):
+        for direction in (-1, 1):
+            moved = list(candidate)
+            moved[i] = max(MINIMUMS[i], moved[i] + direction * step * scale)
+            moved = tuple(moved)
+            if moved != candidate:
+                found.append(moved)
+    for direction in (-1, 1):
+        moved = tuple(max(minimum, value + direction * step * scale)
+                      for value, step, minimum in zip(candidate, STEPS, MINIMUMS))
+        if moved != candidate and moved not in found:
+            found.append(moved)
+    return found
+
+
+def evaluation_key(class_name, candidate, level, battles, seed):
+    enemy = opponent_stats("Enemy", level)
+    enemy = ",".join(str(enemy[name]) for name in STAT_NAMES)
+    stats = ",".join(str(value) for value in candidate)
+    return f"{class_name}:{stats}|L{level}|Enemy:{enemy}|{battles}|{seed}|r{RULES_VERSION}"
+
+
+def evaluate(class_name, candidate, level, battles, seed):
+    stream = np.random.SeedSequence(seed, spawn_key=(level,))
+    player_stats = candidate_stats(class_name, candidate, level)
+    enemy_stats = opponent_stats("Enemy", level)
+    result = simulate(class_name, battles, np.random.default_rng(stream),
+                      player_stats=player_stats, enemy_stats=enemy_stats)
+    hero_left = np.clip(1 - result.damage_taken / player_stats['health'], 0, 1)
+    enemy_left = np.clip(1 - result.damage_dealt / enemy_stats['health'], 0, 1)
+    return {
+        'key': evaluation_key(class_name, candidate, level, battles, seed),
+        'wins': int(result.won.sum()),
+        'battles': battles,
+        'margin': float(np.where(result.won, hero_left, -enemy_left).mean())
+    }
+
+
+def wilson_interval(wins, battles, z=Z_95):
+    if battles == 0:
+        return 0.0, 1.0
+    rate = wins / battles
+    denominator = 1 + z * z / battles
+    centre = (rate + z * z / (2 * battles)) / denominator
+    margin = z * math.sqrt(rate * (1 - rate) / battles + z * z / (4 * battles * battles)) / denominator
+    return max(0.0, centre - margin), min(1.0, centre + margin)
+
+
+def load_cache(path):
+    cache = {}
+    if path is None or not os.path.exists(path):
+        return cache
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            cache[record['key']] = record
+    return cache
+
+
+class StatBalancer:
+    def __init__(self, targets=DEFAULT_TARGETS, battles=20000, seed=0, workers=None,
+                 cache_path=None, max_rounds=50):
+        self.targets = dict(sorted(targets.items()))
+        self.battles = battles
+        self.seed = seed
+        self.workers = workers
+        self.cache_path = cache_path
+        self.max_rounds = max_rounds
+        self.cache = load_cache(cache_path)
+        self.evaluated = 0
+        self.reused = 0
+
+    def win_rates(self, pool, requests, battles=None, seed=None):
+        battles = battles or self.battles
+        seed = self.seed if seed is None else seed
+        pending = {}
+        for class_name, candidate in requests:
+            for level in self.targets:
+                key = evaluation_key(class_name, candidate, level, battles, seed)
+                if key in self.cache or key in pending:
+                    self.reused += 1
+                    continue
+                pending[key] = pool.submit(evaluate, class_name, candidate, level, battles, seed)
+        if pending:
+            out = open(self.cache_path, "a") if self.cache_path else None
+            try:
+                for key, future in pending.items():
+                    record = future.result()
+                    self.cache[key] = record
+                    self.evaluated += 1
+                    if out is not None:
+                        out.write(json.dumps(record) + "\n")
+            finally:
+                if out is not None:
+                    out.close()
+        rates = {}
+        for class_name, candidate in requests:
+            rates[(class_name, candidate)] = {
+                level: self.cache[evaluation_key(class_name, candidate, level, battles, seed)]
+                for level in self.targets
+            }
+        return rates
+
+    def loss(self, records):
+        miss = sum((records[level]['wins'] / records[level]['battles'] - target) ** 2
+                   for level, target in self.targets.items())
+        margin = sum(records[level]['margin'] ** 2 for level in self.targets)
+        return miss, margin
+
+    def balance(self, classes=PLAYER_CLASSES, on_round=None):
+        current = {class_name: candidate_from_tables(class_name) for class_name in classes}
+        scales = {class_name: INITIAL_SCALE for class_name in classes}
+        with ProcessPoolExecutor(max_workers=self.workers or os.cpu_count()) as pool:
+            rates = self.win_rates(pool, list(current.items()))
+            losses = {class_name: self.loss(rates[(class_name, candidate)])
+                      for class_name, candidate in current.items()}
+            for round_number in range(1, self.max_rounds + 1):
+                active = [class_name for class_name in classes if 0 < scales[class_name] <= MAX_SCALE]
+                if not active:
+                    break
+                requests = [(class_name, moved) for class_name in active
+                            for moved in neighbours(current[class_name], scales[class_name])]
+                rates = self.win_rates(pool, requests)
+                for class_name in active:
+                    best, best_loss = None, losses[class_name]
+                    flat = True
+                    for name, moved in requests:
+                        if name != class_name:
+                            continue
+                        loss = self.loss(rates[(class_name, moved)])
+                        flat = flat and loss == losses[class_name]
+                        if loss < best_loss:
+                            best, best_loss = moved, loss
+                    if best is not None:
+                        current[class_name] = best
+                        losses[class_name] = best_loss
+                    elif flat:
+                        scales[class_name] *= 2
+                    else:
+                        scales[class_name] //= 2
+                if on_round is not None:
+                    on_round(round_number, current, losses)
+        return current
+
+    def confirm(self, current, battles=None, seed=None):
+        seed = self.seed + 1 if seed is None else seed
+        with ProcessPoolExecutor(max_workers=self.workers or os.cpu_count()) as pool:
+            return self.win_rates(pool, list(current.items()), battles, seed)
+
+
+def format_tables(current, confirmed, targets):
+    lines = []
+    for class_name, candidate in current.items():
+        records = confirmed[(class_name, candidate)]
+        for level, target in targets.items():
+            record = records[level]
+            low, high = wilson_interval(record['wins'], record['battles'])
+            lines.append(f"# {class_name} L{level}: win rate {record['wins'] / record['battles']:.4f} "
+                         f"[{low:.4f}, {high:.4f}] target {target:.2f}")
+
+    with open(CLASSES_PATH, encoding="utf-8") as f:
+        entries = json.load(f)
+    tuned = {}
+    for class_name, candidate in current.items():
+        entry = tuned[class_name] = entries[class_name]
+        entry['stats'] = dict(entry['stats'], **dict(zip(STAT_NAMES, candidate[:3])))
+        entry['growth'] = dict(entry.get('growth', {}), **dict(zip(STAT_NAMES, candidate[3:])))
+    lines.append("")
+    lines.append(json.dumps(tuned, indent=4, ensure_ascii=False))
+    return "\n".join(lines)
+
+
+def parse_targets(values):
+    targets = {}
+    for value in values:
+        level, rate = value.split("=")
+        targets[int(level)] = float(rate)
+    return targets
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Tune class stats towards target win rates against each Enemy wave")
+    parser.add_argument("--targets", nargs="+", default=None,
+                        help="level=win_rate pairs, e.g. 1=0.55 5=0.8")
+    parser.add_argument("--classes", nargs="+", default=PLAYER_CLASSES)
+    parser.add_argument("--battles", type=int, default=20000)
+    parser.add_argument("--confirm-battles", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--max-rounds", type=int, default=50)
+    parser.add_argument("--cache", default="balance_cache.jsonl")
+    args = parser.parse_args()
+
+    targets = parse_targets(args.targets) if args.targets else DEFAULT_TARGETS
+    balancer = StatBalancer(targets, args.battles, args.seed, args.workers, args.cache, args.max_rounds)
+    start = time.perf_counter()
+
+    def report(round_number, current, losses):
+        print(f"round {round_number}: " + ", ".join(
+            f"{name} {current[name]} loss {losses[name][0]:.4f}" for name in current), flush=True)
+
+    current = balancer.balance(args.classes, report)
+    confirmed = balancer.confirm(current, args.confirm_battles)
+    print(f"Finished in {time.perf_counter() - start:.1f}s "
+          f"({balancer.evaluated} evaluations, {balancer.reused} reused)")
+    print()
+    print(format_tables(current, confirmed, balancer.targets))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,236 @@
+import argparse
+import time
+
+import numpy as np
+from src.components.class_registry import get_class, CHARACTER_STATS, LEVEL_UP_GROWTH, PLAYER_CLASSES
+from src.components.waves import WAVE_ENEMY, wave_stats
+from src.utils.constants import (
+    BURN_CHANCE, BURN_DAMAGE, BURN_DURATION, BLESS_DEFENSE, BLESS_DURATION, STEALTH_DURATION
+)
+
+BASE_CRIT_CHANCE = 0.1
+DODGE_CHANCE = 0.05
+CRIT_MULTIPLIER = 1.5
+SPECIAL_COOLDOWN = 3
+ENEMY_SPECIAL_CHANCE = 0.3
+STEALTH_CRIT_CHANCE = 0.5
+MAX_TURNS = 1000
+DAMAGE_ABILITIES = ("strike", "fireball")
+CHUNK_SIZE = 250000
+# Bump when combat rules change so cached balance and tournament results are recomputed.
+RULES_VERSION = 2
+
+
+class SimulationResult:
+    def __init__(self, class_name, won, turns, damage_dealt, damage_taken):
+        self.class_name = class_name
+        self.won = won
+        self.turns = turns
+        self.damage_dealt = damage_dealt
+        self.damage_taken = damage_taken
+
+    @property
+    def battles(self):
+        return len(self.won)
+
+    def win_rate(self):
+        return float(self.won.mean()) if self.battles else 0.0
+
+    def turn_distribution(self):
+        counts = np.bincount(self.turns)
+        return counts / max(1, self.battles)
+
+    def damage_histogram(self, bins=20, taken=False):
+        values = self.damage_taken if taken else self.damage_dealt
+        return np.histogram(values, bins=bins)
+
+    def merge(self, other):
+        return SimulationResult(
+            self.class_name,
+            np.concatenate([self.won, other.won]),
+            np.concatenate([self.turns, other.turns]),
+            np.concatenate([self.damage_dealt, other.damage_dealt]),
+            np.concatenate([self.damage_taken, other.damage_taken])
+        )
+
+
+def resolve_hits(rng, damage, defense, crit_chance, dodge_chance):
+    n = len(defense)
+    dodged = rng.random(n) < dodge_chance
+    crit = rng.random(n) < crit_chance
+    damage = np.where(crit, damage * CRIT_MULTIPLIER, damage)
+    return np.where(dodged, 0.0, np.maximum(1.0, damage - defense))
+
+
+def leveled_stats(class_name, level=1):
+    return stats_at_level(CHARACTER_STATS[class_name], LEVEL_UP_GROWTH.get(class_name, {}), level)
+
+
+def opponent_stats(class_name, level=1):
+    if class_name == WAVE_ENEMY:
+        return dict(wave_stats(level))
+    return leveled_stats(class_name, level)
+
+
+def stats_at_level(base, growth, level):
+    gained = level - 1
+    return {
+        'health': base['health'] + growth.get('health', 0) * gained,
+        'attack': base['attack'] + growth.get('attack', 0) * gained,
+        'defense': base['defense'] + growth.get('defense', 0) * gained,
+        'crit_chance': base.get('crit_chance', BASE_CRIT_CHANCE) + growth.get('crit_chance', 0) * gained
+    }
+
+
+def simulate(class_name, battles, rng=None, player_stats=None, enemy_stats=None,
+             use_special=True, max_turns=MAX_TURNS, enemy_class="Enemy"):
+    if rng is None:
+        rng = np.random.default_rng()
+    player_stats = player_stats or CHARACTER_STATS[class_name]
+    enemy_stats = enemy_stats or CHARACTER_STATS[enemy_class]
+    player_special = 1.0 if use_special else 0.0
+    result = None
+    for start in range(0, battles, CHUNK_SIZE):
+        n = min(CHUNK_SIZE, battles - start)
+        player = _Side(class_name, player_stats, n, player_special)
+        enemy = _Side(enemy_class, enemy_stats, n, ENEMY_SPECIAL_CHANCE)
+        chunk = _simulate_chunk(player, enemy, n, rng, max_turns)
+        result = chunk if result is None else result.merge(chunk)
+    return result
+
+
+class _Side:
+    def __init__(self, class_name, stats, n, special_chance):
+        character_class = get_class(class_name, stats)
+        self.class_name = class_name
+        self.ability = character_class.ability
+        self.multiplier = character_class.multiplier
+        self.max_health = float(stats['health'])
+        self.health = np.full(n, self.max_health)
+        self.attack = float(stats['attack'])
+        self.defense = np.full(n, float(stats['defense']))
+        self.base_crit_chance = stats.get('crit_chance', BASE_CRIT_CHANCE)
+        self.crit_chance = np.full(n, self.base_crit_chance)
+        self.cooldown = np.zeros(n, dtype=np.int8)
+        self.special_chance = special_chance
+        self.burn_left = np.zeros(n, dtype=np.int8)
+        self.bless_left = np.zeros(n, dtype=np.int8)
+        self.stealth_left = np.zeros(n, dtype=np.int8)
+
+
+def _simulate_chunk(player, enemy, n, rng, max_turns):
+    won = np.zeros(n, dtype=bool)
+    turns = np.zeros(n, dtype=np.int32)
+    dealt = np.zeros(n)
+    taken = np.zeros(n)
+    active = np.ones(n, dtype=bool)
+
+    for _ in range(max_turns):
+        idx = np.flatnonzero(active)
+        if len(idx) == 0:
+            break
+        turns[idx] += 1
+
+        dealt[idx] += _act(rng, player, enemy, idx)
+        killed = idx[enemy.health[idx] <= 0]
+        won[killed] = True
+        active[killed] = False
+
+        idx = np.flatnonzero(active)
+        taken[idx] += _act(rng, enemy, player, idx)
+        player.cooldown[idx] = np.maximum(0, player.cooldown[idx] - 1)
+        enemy.cooldown[idx] = np.maximum(0, enemy.cooldown[idx] - 1)
+        active[idx[player.health[idx] <= 0]] = False
+
+        idx = np.flatnonzero(active)
+        taken[idx] += _settle_effects(rng, player, idx)
+        dealt[idx] += _settle_effects(rng, enemy, idx)
+        killed = idx[enemy.health[idx] <= 0]
+        won[killed] = True
+        active[killed] = False
+        active[idx[player.health[idx] <= 0]] = False
+
+    return SimulationResult(player.class_name, won, turns, dealt, taken)
+
+
+def _act(rng, actor, target, idx):
+    ready = actor.cooldown[idx] == 0
+    if actor.special_chance >= 1:
+        special = ready
+    else:
+        special = (rng.random(len(idx)) < actor.special_chance) & ready
+    damage = np.zeros(len(idx))
+
+    strikers = ~special
+    damage[strikers] = _hit(rng, target, idx[strikers], actor.attack)
+
+    casters = idx[special]
+    actor.cooldown[casters] = SPECIAL_COOLDOWN
+    if actor.ability in DAMAGE_ABILITIES:
+        damage[special] = _hit(rng, target, casters, actor.attack * actor.multiplier)
+        if actor.ability == "fireball":
+            target.burn_left[casters[rng.random(len(casters)) < BURN_CHANCE]] = BURN_DURATION
+    elif actor.ability == "stealth":
+        actor.crit_chance[casters] = STEALTH_CRIT_CHANCE
+        actor.stealth_left[casters] = STEALTH_DURATION
+    elif actor.ability == "holy_light":
+        actor.health[casters] = np.minimum(actor.max_health,
+                                           actor.health[casters] + actor.attack * actor.multiplier)
+        fresh = casters[actor.bless_left[casters] == 0]
+        actor.defense[fresh] += BLESS_DEFENSE
+        actor.bless_left[casters] = BLESS_DURATION
+    return damage
+
+
+def _hit(rng, target, idx, damage):
+    hits = resolve_hits(rng, damage, target.defense[idx], target.crit_chance[idx], DODGE_CHANCE)
+    target.health[idx] = np.maximum(0.0, target.health[idx] - hits)
+    return hits
+
+
+def _settle_effects(rng, side, idx):
+    damage = np.zeros(len(idx))
+    burning = side.burn_left[idx] > 0
+    if burning.any():
+        targets = idx[burning]
+        damage[burning] = _hit(rng, side, targets, BURN_DAMAGE)
+        side.burn_left[targets] -= 1
+    blessed = idx[side.bless_left[idx] > 0]
+    if len(blessed):
+        side.bless_left[blessed] -= 1
+        side.defense[blessed[side.bless_left[blessed] == 0]] -= BLESS_DEFENSE
+    hidden = idx[side.stealth_left[idx] > 0]
+    if len(hidden):
+        side.stealth_left[hidden] -= 1
+        side.crit_chance[hidden[side.stealth_left[hidden] == 0]] = side.base_crit_chance
+    return damage
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Vectorized Monte Carlo battle simulator")
+    parser.add_argument("--battles", type=int, default=1000000)
+    parser.add_argument("--seed", type=int, default=None)
+    parser.add_argument("--classes", nargs="+", default=PLAYER_CLASSES)
+    parser.add_argument("--attack-only", action="store_true")
+    args = parser.parse_args()
+
+    rng = np.random.default_rng(args.seed)
+    for class_name in args.classes:
+        start = time.perf_counter()
+        result = simulate(class_name, args.battles, rng, use_special=not args.attack_only)
+        elapsed = time.perf_counter() - start
+        print(f"{class_name}: win rate {result.win_rate():.4f}, "
+              f"mean turns {result.turns.mean():.2f}, "
+              f"mean damage dealt {result.damage_dealt.mean():.1f}, "
+              f"mean damage taken {result.damage_taken.mean():.1f} "
+              f"({result.battles} battles in {elapsed:.2f}s)")
+        distribution = result.turn_distribution()
+        common = np.argsort(distribution)[::-1][:5]
+        print("  turns: " + ", ".join(f"{t}: {distribution[t]:.3f}" for t in sorted(common)))
+        counts, edges = result.damage_histogram(10)
+        print("  damage dealt: " + ", ".join(
+            f"{edges[i]:.0f}-{edges[i + 1]:.0f}: {counts[i]}" for i in range(len(counts))))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,326 @@
+import argparse
+import time
+
+import numpy as np
+from src.simulation.monte_carlo import (
+    leveled_stats, BASE_CRIT_CHANCE, DODGE_CHANCE, CRIT_MULTIPLIER, SPECIAL_COOLDOWN,
+    ENEMY_SPECIAL_CHANCE, BURN_CHANCE, BURN_DAMAGE, BURN_DURATION, BLESS_DEFENSE,
+    BLESS_DURATION, STEALTH_CRIT_CHANCE, STEALTH_DURATION, DAMAGE_ABILITIES
+)
+from src.components.class_registry import get_class
+
+# Health is tracked in quarter points so crits and 1.5x specials stay integral.
+SCALE = 4
+# pack() gives each side's scaled health this many bits of the state key.
+HEALTH_BITS = 16
+DENSE_SCC_LIMIT = 800
+WIN = -1
+
+
+class WinProbabilitySolver:
+    def __init__(self, hero, opponent="Enemy", hero_stats=None, opponent_stats=None,
+                 use_special=True, opponent_special_chance=ENEMY_SPECIAL_CHANCE):
+        self.hero = Fighter(hero, hero_stats or leveled_stats(hero),
+                             1.0 if use_special else 0.0)
+        self.opponent = Fighter(opponent, opponent_stats or leveled_stats(opponent),
+                                 opponent_special_chance)
+        self.memo = {}
+
+    def initial_state(self):
+        return (self.hero.max_health, self.opponent.max_health, 0, 0, 0, 0, 0, 0, 0, 0)
+
+    def state_from_characters(self, player, enemy):
+        return state_from_characters(player, enemy)
+
+    def win_probability(self, state=None):
+        key = pack(state or self.initial_state())
+        if key not in self.memo:
+            self._solve_from(key)
+        return self.memo[key]
+
+    def transitions(self, key):
+        state = unpack(key)
+        win = 0.0
+        outcomes = {}
+        for p, after in self._turn(state):
+            if after == WIN:
+                win += p
+            elif after is not None:
+                packed = pack(after)
+                outcomes[packed] = outcomes.get(packed, 0.0) + p
+        return win, outcomes
+
+    def _turn(self, state):
+        hero, opponent = self.hero, self.opponent
+        p_hp, e_hp, p_cd, e_cd, p_boost, e_boost, p_bless, e_bless, p_burn, e_burn = state
+        for p1, (p_hp1, e_hp1, p_cd1, p_boost1, p_bless1, e_lit) in hero.act(
+                p_hp, e_hp, p_cd, p_boost, p_bless, opponent, e_boost, e_bless):
+            if e_hp1 <= 0:
+                yield p1, WIN
+                continue
+            e_burn1 = BURN_DURATION if e_lit else e_burn
+            for p2, (e_hp2, p_hp2, e_cd2, e_boost2, e_bless2, p_lit) in opponent.act(
+                    e_hp1, p_hp1, e_cd, e_boost, e_bless, hero, p_boost1, p_bless1):
+                if p_hp2 <= 0:
+                    yield p1 * p2, None
+                    continue
+                p_burn2 = BURN_DURATION if p_lit else p_burn
+                for p3, after in end_turn(hero, opponent, (p_hp2, e_hp2, p_cd1, e_cd2, p_boost1, e_boost2,
+                                                           p_bless1, e_bless2, p_burn2, e_burn1)):
+                    yield p1 * p2 * p3, after
+
+    def _solve_from(self, root):
+        memo = self.memo
+        index = {}
+        low = {}
+        stack = []
+        on_stack = set()
+        transitions = {}
+        counter = 0
+
+        def visit(key):
+            nonlocal counter
+            index[key] = low[key] = counter
+            counter += 1
+            stack.append(key)
+            on_stack.add(key)
+            transitions[key] = self.transitions(key)
+            return (key, iter(transitions[key][1]))
+
+        call_stack = [visit(root)]
+        while call_stack:
+            key, successors = call_stack[-1]
+            for successor in successors:
+                if successor in memo:
+                    continue
+                if successor not in index:
+                    call_stack.append(visit(successor))
+                    break
+                if successor in on_stack:
+                    low[key] = min(low[key], index[successor])
+            else:
+                call_stack.pop()
+                if call_stack:
+                    parent = call_stack[-1][0]
+                    low[parent] = min(low[parent], low[key])
+                if low[key] == index[key]:
+                    component = []
+                    while True:
+                        member = stack.pop()
+                        on_stack.discard(member)
+                        component.append(member)
+                        if member == key:
+                            break
+                    self._solve_component(component, transitions)
+                    for member in component:
+                        del transitions[member]
+
+    def _solve_component(self, component, transitions):
+        memo = self.memo
+        if len(component) == 1:
+            key = component[0]
+            win, outcomes = transitions[key]
+            stay = outcomes.get(key, 0.0)
+            value = win + sum(p * memo[k] for k, p in outcomes.items() if k != key)
+            memo[key] = value / (1.0 - stay) if stay < 1.0 else 0.0
+            return
+
+        position = {key: i for i, key in enumerate(component)}
+        size = len(component)
+        constant = np.zeros(size)
+        rows = []
+        for i, key in enumerate(component):
+            win, outcomes = transitions[key]
+            inside = []
+            for successor, p in outcomes.items():
+                j = position.get(successor)
+                if j is None:
+                    win += p * memo[successor]
+                else:
+                    inside.append((j, p))
+            constant[i] = win
+            rows.append(inside)
+
+        if size <= DENSE_SCC_LIMIT:
+            matrix = np.eye(size)
+            for i, inside in enumerate(rows):
+                for j, p in inside:
+                    matrix[i, j] -= p
+            values = np.linalg.solve(matrix, constant)
+        else:
+            values = constant.copy()
+            for _ in range(100000):
+                delta = 0.0
+                for i, inside in enumerate(rows):
+                    value = constant[i] + sum(p * values[j] for j, p in inside)
+                    delta = max(delta, abs(value - values[i]))
+                    values[i] = value
+                if delta < 1e-14:
+                    break
+        for key, value in zip(component, values):
+            memo[key] = float(value)
+
+
+class Fighter:
+    def __init__(self, class_name, stats, special_chance):
+        character_class = get_class(class_name, stats)
+        self.class_name = class_name
+        self.ability = character_class.ability
+        self.multiplier = character_class.multiplier
+        self.max_health = int(round(stats['health'] * SCALE))
+        if self.max_health >= 1 << HEALTH_BITS:
+            raise ValueError(f"{class_name} health {stats['health']} does not fit the solver's "
+                             f"{HEALTH_BITS}-bit packed state (max {((1 << HEALTH_BITS) - 1) // SCALE})")
+        self.attack = stats['attack']
+        self.defense = stats['defense']
+        self.crit_chance = stats.get('crit_chance', BASE_CRIT_CHANCE)
+        self.special_chance = special_chance
+        self.damage_cache = {}
+
+    def hit(self, health, damage, boost, bless):
+        key = (damage, boost > 0, bless > 0)
+        outcomes = self.damage_cache.get(key)
+        if outcomes is None:
+            crit_chance = STEALTH_CRIT_CHANCE if boost else self.crit_chance
+            defense = (self.defense + (BLESS_DEFENSE if bless else 0)) * SCALE
+            normal = max(SCALE, int(round(damage * SCALE)) - defense)
+            crit = max(SCALE, int(round(damage * CRIT_MULTIPLIER * SCALE)) - defense)
+            hit = 1.0 - DODGE_CHANCE
+            outcomes = [(DODGE_CHANCE, 0), (hit * crit_chance, crit), (hit * (1.0 - crit_chance), normal)]
+            self.damage_cache[key] = outcomes
+        return [(p, max(0, health - amount)) for p, amount in outcomes]
+
+    def burn(self, health, burning, boost, bless):
+        if not burning:
+            return [(1.0, health)]
+        return self.hit(health, BURN_DAMAGE, boost, bless)
+
+    def act(self, health, target_health, cooldown, boost, bless, target, target_boost, target_bless):
+        if cooldown > 0 or self.special_chance <= 0:
+            choices = [(1.0, False)]
+        elif self.special_chance >= 1:
+            choices = [(1.0, True)]
+        else:
+            choices = [(self.special_chance, True), (1.0 - self.special_chance, False)]
+
+        for p, special in choices:
+            for q, after in self.outcomes(special, health, target_health, cooldown, boost, bless,
+                                          target, target_boost, target_bless):
+                yield p * q, after
+
+    def outcomes(self, special, health, target_health, cooldown, boost, bless,
+                 target, target_boost, target_bless):
+        if not special:
+            for q, after in target.hit(target_health, self.attack, target_boost, target_bless):
+                yield q, (health, after, cooldown, boost, bless, False)
+            return
+        if self.ability in DAMAGE_ABILITIES:
+            for q, after in target.hit(target_health, self.attack * self.multiplier,
+                                       target_boost, target_bless):
+                if self.ability == "fireball":
+                    yield q * BURN_CHANCE, (health, after, SPECIAL_COOLDOWN, boost, bless, True)
+                    yield q * (1 - BURN_CHANCE), (health, after, SPECIAL_COOLDOWN, boost, bless, False)
+                else:
+                    yield q, (health, after, SPECIAL_COOLDOWN, boost, bless, False)
+        elif self.ability == "stealth":
+            yield 1.0, (health, target_health, SPECIAL_COOLDOWN, STEALTH_DURATION, bless, False)
+        elif self.ability == "holy_light":
+            healed = min(self.max_health, health + int(round(self.attack * self.multiplier * SCALE)))
+            yield 1.0, (healed, target_health, SPECIAL_COOLDOWN, boost, BLESS_DURATION, False)
+        else:
+            yield 1.0, (health, target_health, SPECIAL_COOLDOWN, boost, bless, False)
+
+
+def end_turn(hero, opponent, state):
+    p_hp, e_hp, p_cd, e_cd, p_boost, e_boost, p_bless, e_bless, p_burn, e_burn = state
+    p_cd, e_cd = max(0, p_cd - 1), max(0, e_cd - 1)
+    for q, p_hp3 in hero.burn(p_hp, p_burn, p_boost, p_bless):
+        for r, e_hp3 in opponent.burn(e_hp, e_burn, e_boost, e_bless):
+            if e_hp3 <= 0:
+                yield q * r, WIN
+            elif p_hp3 <= 0:
+                yield q * r, None
+            else:
+                yield q * r, (p_hp3, e_hp3, p_cd, e_cd, max(0, p_boost - 1), max(0, e_boost - 1),
+                              max(0, p_bless - 1), max(0, e_bless - 1),
+                              max(0, p_burn - 1), max(0, e_burn - 1))
+
+
+def effect_turns(character, name):
+    return max((effect.remaining() for effect in character.effects if effect.name == name), default=0)
+
+
+def state_from_characters(player, enemy):
+    return (
+        int(round(player.health * SCALE)),
+        int(round(enemy.health * SCALE)),
+        player.special_cooldown,
+        enemy.special_cooldown,
+        effect_turns(player, "Stealth"),
+        effect_turns(enemy, "Stealth"),
+        effect_turns(player, "Blessed"),
+        effect_turns(enemy, "Blessed"),
+        effect_turns(player, "Burn"),
+        effect_turns(enemy, "Burn")
+    )
+
+
+def pack(state):
+    p_hp, e_hp, p_cd, e_cd, p_boost, e_boost, p_bless, e_bless, p_burn, e_burn = state
+    key = p_hp << HEALTH_BITS | e_hp
+    key = key << 2 | p_cd
+    key = key << 2 | e_cd
+    key = key << 2 | p_boost
+    key = key << 2 | e_boost
+    key = key << 2 | p_bless
+    key = key << 2 | e_bless
+    key = key << 2 | p_burn
+    return key << 2 | e_burn
+
+
+def unpack(key):
+    e_burn = key & 3
+    key >>= 2
+    p_burn = key & 3
+    key >>= 2
+    e_bless = key & 3
+    key >>= 2
+    p_bless = key & 3
+    key >>= 2
+    e_boost = key & 3
+    key >>= 2
+    p_boost = key & 3
+    key >>= 2
+    e_cd = key & 3
+    key >>= 2
+    p_cd = key & 3
+    key >>= 2
+    return (key >> 16, key & 0xFFFF, p_cd, e_cd, p_boost, e_boost, p_bless, e_bless, p_burn, e_burn)
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Exact win probability by dynamic programming")
+    parser.add_argument("hero")
+    parser.add_argument("opponent", nargs="?", default="Enemy")
+    parser.add_argument("--hero-level", type=int, default=1)
+    parser.add_argument("--opponent-level", type=int, default=1)
+    parser.add_argument("--attack-only", action="store_true")
+    args = parser.parse_args()
+
+    solver = WinProbabilitySolver(args.hero, args.opponent,
+                                  leveled_stats(args.hero, args.hero_level),
+                                  leveled_stats(args.opponent, args.opponent_level),
+                                  use_special=not args.attack_only)
+    start = time.perf_counter()
+    probability = solver.win_probability()
+    cold = time.perf_counter() - start
+    start = time.perf_counter()
+    solver.win_probability()
+    warm = time.perf_counter() - start
+    print(f"{args.hero} L{args.hero_level} vs {args.opponent} L{args.opponent_level}: "
+          f"{probability:.6f} ({len(solver.memo)} states, cold {cold * 1000:.1f}ms, "
+          f"warm {warm * 1000:.3f}ms)")
+
+
+if __name__ == "__main__":
+    main()
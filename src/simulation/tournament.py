@@ -0,0 +1,166 @@
+import argparse
+import hashlib
+import json
+import os
+import time
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+import numpy as np
+from src.components.class_registry import CHARACTER_STATS, PLAYER_CLASSES
+from src.simulation.monte_carlo import RULES_VERSION, simulate, leveled_stats, opponent_stats
+
+DEFAULT_LEVELS = [1, 2, 3, 5, 8]
+
+
+def build_matchups(levels=DEFAULT_LEVELS):
+    matchups = []
+    for hero in PLAYER_CLASSES:
+        for opponent in CHARACTER_STATS:
+            matchups.append((hero, 1, opponent, 1))
+    for hero in PLAYER_CLASSES:
+        for level in levels:
+            if level != 1:
+                matchups.append((hero, level, "Enemy", level))
+    return matchups
+
+
+def build_tasks(matchups, battles, chunk_size):
+    tasks = []
+    for matchup in matchups:
+        for chunk, start in enumerate(range(0, battles, chunk_size)):
+            tasks.append((matchup, battles, chunk, min(chunk_size, battles - start)))
+    return tasks
+
+
+def stats_text(stats):
+    return ",".join(f"{value:g}" for value in stats.values())
+
+
+def task_key(matchup, battles, chunk):
+    hero, hero_level, opponent, opponent_level = matchup
+    hero_text = stats_text(leveled_stats(hero, hero_level))
+    opponent_text = stats_text(opponent_stats(opponent, opponent_level))
+    return (f"{hero}:{hero_level}:{hero_text}|{opponent}:{opponent_level}:{opponent_text}"
+            f"|{battles}|{chunk}|r{RULES_VERSION}")
+
+
+def stream_key(key):
+    return int.from_bytes(hashlib.sha256(key.encode()).digest()[:8], 'little')
+
+
+def run_task(matchup, total, chunk, battles, seed, chunk_size):
+    hero, hero_level, opponent, opponent_level = matchup
+    key = task_key(matchup, total, chunk)
+    stream = np.random.SeedSequence(seed, spawn_key=(stream_key(key),))
+    result = simulate(hero, battles, np.random.default_rng(stream),
+                      player_stats=leveled_stats(hero, hero_level),
+                      enemy_stats=opponent_stats(opponent, opponent_level),
+                      enemy_class=opponent)
+    return {
+        'key': key,
+        'hero': hero,
+        'hero_level': hero_level,
+        'opponent': opponent,
+        'opponent_level': opponent_level,
+        'chunk': chunk,
+        'seed': seed,
+        'chunk_size': chunk_size,
+        'battles': battles,
+        'wins': int(result.won.sum()),
+        'turns': int(result.turns.sum())
+    }
+
+
+def load_results(path, seed, chunk_size):
+    results = {}
+    if path is None or not os.path.exists(path):
+        return results
+    with open(path) as f:
+        for line in f:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue
+            if record.get('seed') == seed and record.get('chunk_size') == chunk_size:
+                results[record['key']] = record
+    return results
+
+
+def win_rate_matrix(records):
+    totals = {}
+    for record in records:
+        row = (record['hero'], record['hero_level'])
+        column = (record['opponent'], record['opponent_level'])
+        wins, battles = totals.get((row, column), (0, 0))
+        totals[(row, column)] = (wins + record['wins'], battles + record['battles'])
+    matrix = {}
+    for (row, column), (wins, battles) in totals.items():
+        matrix.setdefault(row, {})[column] = wins / battles
+    return matrix
+
+
+def format_matrix(matrix):
+    columns = sorted({column for row in matrix.values() for column in row},
+                     key=lambda c: (c[0] == "Enemy", c[0], c[1]))
+    names = [f"{name} L{level}" for name, level in columns]
+    lines = [" " * 14 + "".join(f"{name:>12}" for name in names)]
+    for row in sorted(matrix, key=lambda r: (r[0], r[1])):
+        cells = "".join(
+            f"{matrix[row][column]:>12.4f}" if column in matrix[row] else f"{'-':>12}"
+            for column in columns
+        )
+        lines.append(f"{row[0] + ' L' + str(row[1]):<14}{cells}")
+    return "\n".join(lines)
+
+
+def run_tournament(battles=100000, seed=0, levels=DEFAULT_LEVELS, workers=None,
+                   chunk_size=25000, results_path=None, on_result=None):
+    tasks = build_tasks(build_matchups(levels), battles, chunk_size)
+    keys = {task_key(*task[:3]) for task in tasks}
+    done = {key: record for key, record in load_results(results_path, seed, chunk_size).items() if key in keys}
+    tasks = [task for task in tasks if task_key(*task[:3]) not in done]
+    out = open(results_path, "a") if results_path else None
+    try:
+        with ProcessPoolExecutor(max_workers=workers or os.cpu_count()) as pool:
+            futures = [pool.submit(run_task, *task, seed, chunk_size) for task in tasks]
+            for future in as_completed(futures):
+                record = future.result()
+                done[record['key']] = record
+                if out is not None:
+                    out.write(json.dumps(record) + "\n")
+                    out.flush()
+                if on_result is not None:
+                    on_result(record, len(done))
+    finally:
+        if out is not None:
+            out.close()
+    return win_rate_matrix(done.values())
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Class-vs-class tournament across all cores")
+    parser.add_argument("--battles", type=int, default=100000)
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--levels", type=int, nargs="+", default=DEFAULT_LEVELS)
+    parser.add_argument("--workers", type=int, default=None)
+    parser.add_argument("--chunk-size", type=int, default=25000)
+    parser.add_argument("--results", default="tournament_results.jsonl")
+    args = parser.parse_args()
+
+    total = len(build_tasks(build_matchups(args.levels), args.battles, args.chunk_size))
+    start = time.perf_counter()
+
+    def report(record, completed):
+        rate = record['wins'] / record['battles']
+        print(f"[{completed}/{total}] {record['hero']} L{record['hero_level']} vs "
+              f"{record['opponent']} L{record['opponent_level']} chunk {record['chunk']}: "
+              f"{rate:.4f}", flush=True)
+
+    matrix = run_tournament(args.battles, args.seed, args.levels, args.workers,
+                            args.chunk_size, args.results, report)
+    print(f"Finished in {time.perf_counter() - start:.1f}s")
+    print(format_matrix(matrix))
+
+
+if __name__ == "__main__":
+    main()
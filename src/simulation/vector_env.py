@@ -0,0 +1,256 @@
+import numpy as np
+from src.simulation.monte_carlo import (
+    leveled_stats, BASE_CRIT_CHANCE, DODGE_CHANCE, CRIT_MULTIPLIER, SPECIAL_COOLDOWN,
+    ENEMY_SPECIAL_CHANCE, BURN_CHANCE, BURN_DAMAGE, BURN_DURATION, BLESS_DEFENSE,
+    BLESS_DURATION, STEALTH_CRIT_CHANCE, STEALTH_DURATION, DAMAGE_ABILITIES
+)
+from src.components.class_registry import get_class
+
+ATTACK = 0
+SPECIAL = 1
+OBSERVATION_SIZE = 9
+DRAWS_PER_STEP = 11
+
+_GOLDEN = np.uint64(0x9E3779B97F4A7C15)
+_MIX1 = np.uint64(0xBF58476D1CE4E5B9)
+_MIX2 = np.uint64(0x94D049BB133111EB)
+
+
+class _Fighters:
+    def __init__(self, class_name, stats, n):
+        character_class = get_class(class_name, stats)
+        self.class_name = class_name
+        self.ability = character_class.ability
+        self.multiplier = character_class.multiplier
+        self.base = stats
+        self.max_health = float(stats['health'])
+        self.attack = float(stats['attack'])
+        self.health = np.full(n, self.max_health)
+        self.defense = np.full(n, float(stats['defense']))
+        self.crit_chance = np.full(n, stats.get('crit_chance', BASE_CRIT_CHANCE))
+        self.cooldown = np.zeros(n)
+        self.burn_left = np.zeros(n)
+        self.bless_left = np.zeros(n)
+        self.stealth_left = np.zeros(n)
+
+    def reset(self, mask):
+        np.copyto(self.health, self.max_health, where=mask)
+        np.copyto(self.defense, float(self.base['defense']), where=mask)
+        np.copyto(self.crit_chance, self.base.get('crit_chance', BASE_CRIT_CHANCE), where=mask)
+        np.copyto(self.cooldown, 0.0, where=mask)
+        np.copyto(self.burn_left, 0.0, where=mask)
+        np.copyto(self.bless_left, 0.0, where=mask)
+        np.copyto(self.stealth_left, 0.0, where=mask)
+
+
+class BattleVectorEnv:
+    def __init__(self, num_envs, hero="Warrior", opponent="Enemy", hero_level=1,
+                 opponent_level=1, max_turns=200):
+        n = num_envs
+        self.num_envs = n
+        self.max_turns = max_turns
+        self.hero = _Fighters(hero, leveled_stats(hero, hero_level), n)
+        self.opponent = _Fighters(opponent, leveled_stats(opponent, opponent_level), n)
+
+        self.observations = np.zeros((n, OBSERVATION_SIZE), dtype=np.float32)
+        self.final_observations = np.zeros((n, OBSERVATION_SIZE), dtype=np.float32)
+        self.rewards = np.zeros(n, dtype=np.float32)
+        self.dones = np.zeros(n, dtype=bool)
+        self.truncated = np.zeros(n, dtype=bool)
+        self.turns = np.zeros(n)
+
+        self.keys = np.zeros(n, dtype=np.uint64)
+        self.steps = np.zeros(n, dtype=np.uint64)
+        self._offsets = np.arange(DRAWS_PER_STEP, dtype=np.uint64)[:, None]
+        self._base = np.zeros(n, dtype=np.uint64)
+        self._bits = np.zeros((DRAWS_PER_STEP, n), dtype=np.uint64)
+        self._scratch = np.zeros((DRAWS_PER_STEP, n), dtype=np.uint64)
+        self._uniform = np.zeros((DRAWS_PER_STEP, n))
+
+        self._damage = np.zeros(n)
+        self._work = np.zeros(n)
+        self._dealt = np.zeros(n)
+        self._crit = np.zeros(n, dtype=bool)
+        self._mask = np.zeros(n, dtype=bool)
+        self._special = np.zeros(n, dtype=bool)
+        self._strike = np.zeros(n, dtype=bool)
+        self._won = np.zeros(n, dtype=bool)
+        self._lost = np.zeros(n, dtype=bool)
+        self._live = np.zeros(n, dtype=bool)
+        self._other = np.zeros(n, dtype=bool)
+        self._all = np.ones(n, dtype=bool)
+
+    def reset(self, seed=None):
+        if seed is None:
+            seeds = np.random.SeedSequence().generate_state(self.num_envs, dtype=np.uint64)
+        elif np.ndim(seed) == 0:
+            seeds = np.random.SeedSequence(seed).generate_state(self.num_envs, dtype=np.uint64)
+        else:
+            seeds = np.asarray(seed, dtype=np.uint64)
+        self.keys[:] = seeds
+        self.steps[:] = 0
+        self._reset_where(self._all)
+        self.dones[:] = False
+        self.truncated[:] = False
+        self.rewards[:] = 0
+        self._observe()
+        return self.observations
+
+    def step(self, actions):
+        hero, opponent = self.hero, self.opponent
+        u = self._draw()
+
+        np.equal(actions, SPECIAL, out=self._special)
+        np.equal(hero.cooldown, 0, out=self._other)
+        np.logical_and(self._special, self._other, out=self._special)
+        np.equal(actions, ATTACK, out=self._strike)
+        self._act(hero, opponent, self._special, self._strike, u[0], u[1], u[2])
+
+        np.less_equal(opponent.health, 0, out=self._won)
+        np.logical_not(self._won, out=self._live)
+
+        np.less(u[3], ENEMY_SPECIAL_CHANCE, out=self._special)
+        np.equal(opponent.cooldown, 0, out=self._other)
+        np.logical_and(self._special, self._other, out=self._special)
+        np.logical_and(self._special, self._live, out=self._special)
+        np.logical_not(self._special, out=self._strike)
+        np.logical_and(self._strike, self._live, out=self._strike)
+        self._act(opponent, hero, self._special, self._strike, u[4], u[5], u[6])
+
+        for side in (hero, opponent):
+            np.subtract(side.cooldown, 1, out=self._work)
+            np.maximum(self._work, 0, out=self._work)
+            np.copyto(side.cooldown, self._work, where=self._live)
+
+        np.less_equal(hero.health, 0, out=self._lost)
+        np.logical_and(self._lost, self._live, out=self._lost)
+        np.logical_not(self._lost, out=self._other)
+        np.logical_and(self._live, self._other, out=self._live)
+
+        self._settle(hero, self._live, u[7], u[8])
+        self._settle(opponent, self._live, u[9], u[10])
+        np.less_equal(opponent.health, 0, out=self._mask)
+        np.logical_and(self._mask, self._live, out=self._mask)
+        np.logical_or(self._won, self._mask, out=self._won)
+        np.logical_not(self._mask, out=self._other)
+        np.logical_and(self._live, self._other, out=self._live)
+        np.less_equal(hero.health, 0, out=self._mask)
+        np.logical_and(self._mask, self._live, out=self._mask)
+        np.logical_or(self._lost, self._mask, out=self._lost)
+
+        self.turns += 1
+        np.greater_equal(self.turns, self.max_turns, out=self.truncated)
+        np.logical_or(self._won, self._lost, out=self._other)
+        np.logical_not(self._other, out=self._other)
+        np.logical_and(self.truncated, self._other, out=self.truncated)
+        np.subtract(self._won, self._lost, out=self.rewards, dtype=np.float32, casting='unsafe')
+        np.logical_or(self._won, self._lost, out=self.dones)
+        np.logical_or(self.dones, self.truncated, out=self.dones)
+
+        self._observe()
+        np.copyto(self.final_observations, self.observations, where=self.dones[:, None])
+        if self.dones.any():
+            self._reset_where(self.dones)
+            self._observe()
+        return self.observations, self.rewards, self.dones
+
+    def _act(self, actor, target, special, strike, u_dodge, u_crit, u_burn):
+        np.copyto(self._damage, actor.attack)
+        if actor.ability in DAMAGE_ABILITIES:
+            np.copyto(self._damage, actor.attack * actor.multiplier, where=special)
+            np.logical_or(strike, special, out=self._mask)
+        else:
+            np.copyto(self._mask, strike)
+        self._hit(target, self._damage, self._mask, u_dodge, u_crit)
+
+        np.copyto(actor.cooldown, float(SPECIAL_COOLDOWN), where=special)
+        if actor.ability == "fireball":
+            np.less(u_burn, BURN_CHANCE, out=self._mask)
+            np.logical_and(self._mask, special, out=self._mask)
+            np.copyto(target.burn_left, float(BURN_DURATION), where=self._mask)
+        elif actor.ability == "stealth":
+            np.copyto(actor.crit_chance, STEALTH_CRIT_CHANCE, where=special)
+            np.copyto(actor.stealth_left, float(STEALTH_DURATION), where=special)
+        elif actor.ability == "holy_light":
+            np.add(actor.health, actor.attack * actor.multiplier, out=self._work)
+            np.minimum(self._work, actor.max_health, out=self._work)
+            np.copyto(actor.health, self._work, where=special)
+            np.equal(actor.bless_left, 0, out=self._mask)
+            np.logical_and(self._mask, special, out=self._mask)
+            np.add(actor.defense, BLESS_DEFENSE, out=self._work)
+            np.copyto(actor.defense, self._work, where=self._mask)
+            np.copyto(actor.bless_left, float(BLESS_DURATION), where=special)
+
+    def _hit(self, target, damage, mask, u_dodge, u_crit):
+        np.less(u_crit, target.crit_chance, out=self._crit)
+        np.copyto(self._dealt, damage)
+        np.multiply(damage, CRIT_MULTIPLIER, out=self._work)
+        np.copyto(self._dealt, self._work, where=self._crit)
+        np.subtract(self._dealt, target.defense, out=self._dealt)
+        np.maximum(self._dealt, 1.0, out=self._dealt)
+        np.less(u_dodge, DODGE_CHANCE, out=self._crit)
+        np.copyto(self._dealt, 0.0, where=self._crit)
+        np.subtract(target.health, self._dealt, out=self._work)
+        np.maximum(self._work, 0.0, out=self._work)
+        np.copyto(target.health, self._work, where=mask)
+
+    def _settle(self, side, live, u_dodge, u_crit):
+        np.greater(side.burn_left, 0, out=self._mask)
+        np.logical_and(self._mask, live, out=self._mask)
+        np.copyto(self._damage, float(BURN_DAMAGE))
+        self._hit(side, self._damage, self._mask, u_dodge, u_crit)
+        np.subtract(side.burn_left, 1, out=self._work)
+        np.copyto(side.burn_left, self._work, where=self._mask)
+
+        np.greater(side.bless_left, 0, out=self._mask)
+        np.logical_and(self._mask, live, out=self._mask)
+        np.subtract(side.bless_left, 1, out=self._work)
+        np.copyto(side.bless_left, self._work, where=self._mask)
+        np.equal(side.bless_left, 0, out=self._crit)
+        np.logical_and(self._mask, self._crit, out=self._mask)
+        np.subtract(side.defense, BLESS_DEFENSE, out=self._work)
+        np.copyto(side.defense, self._work, where=self._mask)
+
+        np.greater(side.stealth_left, 0, out=self._mask)
+        np.logical_and(self._mask, live, out=self._mask)
+        np.subtract(side.stealth_left, 1, out=self._work)
+        np.copyto(side.stealth_left, self._work, where=self._mask)
+        np.equal(side.stealth_left, 0, out=self._crit)
+        np.logical_and(self._mask, self._crit, out=self._mask)
+        np.copyto(side.crit_chance, side.base.get('crit_chance', BASE_CRIT_CHANCE), where=self._mask)
+
+    def _draw(self):
+        bits, scratch = self._bits, self._scratch
+        np.multiply(self.steps, np.uint64(DRAWS_PER_STEP), out=self._base)
+        np.add(self._base, self._offsets, out=bits)
+        np.multiply(bits, _GOLDEN, out=bits)
+        np.add(bits, self.keys, out=bits)
+        np.right_shift(bits, np.uint64(30), out=scratch)
+        np.bitwise_xor(bits, scratch, out=bits)
+        np.multiply(bits, _MIX1, out=bits)
+        np.right_shift(bits, np.uint64(27), out=scratch)
+        np.bitwise_xor(bits, scratch, out=bits)
+        np.multiply(bits, _MIX2, out=bits)
+        np.right_shift(bits, np.uint64(31), out=scratch)
+        np.bitwise_xor(bits, scratch, out=bits)
+        np.right_shift(bits, np.uint64(11), out=bits)
+        np.multiply(bits, 2.0 ** -53, out=self._uniform, casting='unsafe')
+        self.steps += np.uint64(1)
+        return self._uniform
+
+    def _reset_where(self, mask):
+        self.hero.reset(mask)
+        self.opponent.reset(mask)
+        np.copyto(self.turns, 0.0, where=mask)
+
+    def _observe(self):
+        hero, opponent, obs = self.hero, self.opponent, self.observations
+        np.divide(hero.health, hero.max_health, out=obs[:, 0], casting='unsafe')
+        np.divide(opponent.health, opponent.max_health, out=obs[:, 1], casting='unsafe')
+        np.divide(hero.cooldown, SPECIAL_COOLDOWN, out=obs[:, 2], casting='unsafe')
+        np.divide(opponent.cooldown, SPECIAL_COOLDOWN, out=obs[:, 3], casting='unsafe')
+        np.copyto(obs[:, 4], hero.crit_chance, casting='unsafe')
+        np.copyto(obs[:, 5], opponent.crit_chance, casting='unsafe')
+        np.divide(hero.defense, 50.0, out=obs[:, 6], casting='unsafe')
+        np.divide(opponent.defense, 50.0, out=obs[:, 7], casting='unsafe')
+        np.divide(self.turns, self.max_turns, out=obs[:, 8], casting='unsafe')
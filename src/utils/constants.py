@@ -20,11 +20,15 @@ BURN_COLOR = (255, 69, 0)
 BLESS_COLOR = (255, 215, 0)
 STEALTH_COLOR = (128, 128, 128)
 
-CHARACTER_STATS = {
-    'Warrior': {'health': 120, 'attack': 15, 'defense': 10},
-    'Mage': {'health': 80, 'attack': 20, 'defense': 5},
-    'Archer': {'health': 100, 'attack': 18, 'defense': 8},
-    'Rogue': {'health': 90, 'attack': 17, 'defense': 6},
-    'Paladin': {'health': 110, 'attack': 14, 'defense': 12},
-    'Enemy': {'health': 100, 'attack': 12, 'defense': 8}
-} 
\ No newline at end of file
+BURN_CHANCE = 0.5
+BURN_DAMAGE = 5
+BURN_DURATION = 3
+BLESS_DEFENSE = 5
+BLESS_DURATION = 2
+STEALTH_DURATION = 2
+
+LOG_CAPACITY = 256
+
+BASE_XP_REWARD = 50
+WAVE_GROWTH = {'health': 1.12, 'attack': 1.08, 'defense': 1.06}
+WAVE_XP_GROWTH = 1.25
@@ -0,0 +1,59 @@
+import secrets
+from itertools import islice
+from operator import length_hint
+
+import numpy as np
+
+BLOCK_SIZE = 1024
+SEED_BITS = 63
+
+
+class RandomStream:
+    def __init__(self, seed_sequence, block_size=BLOCK_SIZE):
+        self.seed_sequence = seed_sequence
+        self.block_size = block_size
+        self.seek(0)
+
+    def random(self):
+        try:
+            return self._next()
+        except StopIteration:
+            self._refill()
+            return self._next()
+
+    def uniform(self, a, b):
+        return a + (b - a) * self.random()
+
+    def randint(self, a, b):
+        return a + int(self.random() * (b - a + 1))
+
+    def tell(self):
+        return self.blocks * self.block_size - length_hint(self._block)
+
+    def seek(self, position):
+        blocks, offset = divmod(position, self.block_size)
+        self.generator = np.random.default_rng(self.seed_sequence)
+        self.generator.bit_generator.advance(blocks * self.block_size)
+        self.blocks = blocks
+        self._block = iter(())
+        self._next = self._block.__next__
+        if offset:
+            self._refill()
+            next(islice(self._block, offset, offset), None)
+
+    def _refill(self):
+        self._block = iter(self.generator.random(self.block_size).tolist())
+        self._next = self._block.__next__
+        self.blocks += 1
+
+
+class BattleRandom:
+    def __init__(self, seed=None):
+        self.seed = secrets.randbits(SEED_BITS) if seed is None else seed
+        gameplay, decisions, cosmetic = np.random.SeedSequence(self.seed).spawn(3)
+        self.gameplay = RandomStream(gameplay)
+        self.decisions = RandomStream(decisions)
+        self.cosmetic = RandomStream(cosmetic)
+
+
+DEFAULT_RANDOM = BattleRandom()